@@ -51,6 +51,13 @@ class Config:
         "market_activity"  # Default dataset
     )
     
+    # Optional on-disk (Arrow IPC) cache for BigQuery tables, reused across process
+    # restarts. Disabled unless set; point it at a private directory (entries expire by TTL).
+    BIGQUERY_CACHE_DIR: str = os.getenv(
+        "BIGQUERY_CACHE_DIR",
+        ""  # Disabled by default
+    )
+    
     # GCS Data Bucket Settings (Backup/Legacy - keeping for memory persistence)
     GCS_DATA_BUCKET: str = os.getenv(
         "GCS_DATA_BUCKET",
@@ -7,6 +7,7 @@ from app.config import config
 from .tools import (
     list_available_symbols,
     load_price_data,
+    load_price_data_many,
     extract_event_dates,
     compute_event_impact,
     analyze_market_baseline,
@@ -53,7 +54,7 @@ event_impact_agent = Agent(
     ALL DATA IS CACHED IN MEMORY FOR LOW-LATENCY ACCESS (60-minute TTL)
     
     ═══════════════════════════════════════════════════════════════════════════
-    🛠️  YOUR TOOLKIT (8 POWERFUL TOOLS)
+    🛠️  YOUR TOOLKIT (9 POWERFUL TOOLS)
     ═══════════════════════════════════════════════════════════════════════════
     
     EQUITY EVENT ANALYSIS TOOLS:
@@ -69,6 +70,10 @@ event_impact_agent = Agent(
        PURPOSE: Load historical OHLC price data for specific symbol or overview
        USE WHEN: Need to see price data or verify symbol exists
     
+       load_price_data_many(instruments: List[str]) → dict
+       PURPOSE: Same as load_price_data for several instruments from one table read
+       USE WHEN: Comparing or checking more than one instrument at once
+    
     3️⃣  extract_event_dates(event_type: str, symbol: Optional[str], 
                             start_date: Optional[str], end_date: Optional[str]) → dict
        ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -371,6 +376,7 @@ event_impact_agent = Agent(
     tools=[
         list_available_symbols,
         load_price_data,
+        load_price_data_many,
         extract_event_dates,
         compute_event_impact,
         analyze_market_baseline,
@@ -12,14 +12,26 @@ import numpy as np
 from google.cloud import bigquery
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
+from pathlib import Path
 import json
+import copy
 from functools import lru_cache
+from concurrent.futures import Future
 import hashlib
+import os
 import platform
+import re
 import sys
+import threading
 
 from app.config import config
 
+# Arrow IPC (feather) files back the on-disk table cache, when pyarrow is installed
+try:
+    from pyarrow import feather
+except ImportError:
+    feather = None
+
 # Platform detection for cross-platform compatibility
 PLATFORM = platform.system()  # 'Windows', 'Linux', 'Darwin' (macOS)
 IS_WINDOWS = PLATFORM == 'Windows'
@@ -58,6 +70,14 @@ def sanitize_for_json(obj):
     return obj
 
 
+def _json_float(value, ndigits: int):
+    """Round a scalar to a native float, or None if it is NaN/Inf (leaf-level sanitize_for_json)."""
+    value = float(value)
+    if np.isnan(value) or np.isinf(value):
+        return None
+    return round(value, ndigits)
+
+
 class BigQueryDataLoader:
     """
     Intelligent data loader for event and price datasets from BigQuery.
@@ -69,12 +89,20 @@ class BigQueryDataLoader:
     def __init__(self):
         """Initialize BigQuery client and cache"""
         self.bq_client = bigquery.Client(project=config.BIGQUERY_PROJECT)
+        self._bqstorage_client = None  # Storage Read API client, created on the first download
+        self._bqstorage_checked = False
+        self._bqstorage_lock = threading.Lock()
         self.project_id = config.BIGQUERY_PROJECT
         self.dataset_id = config.BIGQUERY_DATASET
         self._memory_cache = {}  # In-memory cache for immediate access
         self._cache_metadata = {}  # Track cache freshness
+        self._cache_tables = {}  # cache_key -> table name, for per-table clearing
+        self._cache_dir = Path(config.BIGQUERY_CACHE_DIR) if config.BIGQUERY_CACHE_DIR and feather else None
         self._available_tables = None  # Cache of available tables
         self._table_list_time = None  # When we last listed tables
+        self._inflight = {}  # cache_key -> Future of a load currently running
+        # Guards _inflight and the three cache dicts above (prefetch threads write them too)
+        self._inflight_lock = threading.Lock()
         
         print(f"[BigQuery] Data Loader initialized with caching")
         print(f"   Platform: {PLATFORM} ({'Windows' if IS_WINDOWS else 'Linux' if IS_LINUX else 'macOS' if IS_MACOS else 'Unknown'})")
@@ -82,9 +110,38 @@ class BigQueryDataLoader:
         print(f"   Dataset: {self.dataset_id}")
         print(f"   Data Source: BigQuery (SQL-based)")
     
-    def _get_cache_key(self, table_name: str, where_clause: Optional[str] = None) -> str:
+    def _get_bqstorage_client(self):
+        """
+        Shared Storage Read API client (Arrow over gRPC), created on the first download.
+        google-cloud-bigquery-storage is optional: None falls back to to_dataframe's default download path.
+        """
+        with self._bqstorage_lock:
+            if not self._bqstorage_checked:
+                self._bqstorage_checked = True
+                try:
+                    from google.cloud import bigquery_storage
+                    self._bqstorage_client = bigquery_storage.BigQueryReadClient()
+                except ImportError:
+                    pass
+                except Exception as e:
+                    print(f"[WARNING] BigQuery Storage API unavailable, using REST downloads: {e}")
+            return self._bqstorage_client
+    
+    def _get_cache_key(self, table_name: str, where_clause: Optional[str] = None,
+                       query_parameters: Optional[Dict[str, str]] = None,
+                       limit: Optional[int] = None,
+                       columns: Optional[List[str]] = None,
+                       order_by: Optional[str] = None) -> str:
         """Generate cache key for a table/query"""
         key_string = f"{table_name}:{where_clause or 'full'}"
+        if query_parameters:
+            key_string += ":" + json.dumps(query_parameters, sort_keys=True)
+        if limit:
+            key_string += f":limit={limit}"
+        if columns:
+            key_string += ":columns=" + json.dumps(list(columns))
+        if order_by:
+            key_string += f":order_by={order_by}"
         return hashlib.md5(key_string.encode()).hexdigest()
     
     def _is_cache_valid(self, cache_key: str, cache_ttl_minutes: int) -> bool:
@@ -95,6 +152,41 @@ class BigQueryDataLoader:
         age_minutes = (datetime.now() - cache_time).total_seconds() / 60
         return age_minutes < cache_ttl_minutes
     
+    def _disk_cache_path(self, table_name: str, cache_key: str) -> Path:
+        return self._cache_dir / f"{table_name}-{cache_key}.feather"
+    
+    def _read_disk_cache(self, table_name: str, cache_key: str, cache_ttl_minutes: int) -> Optional[pd.DataFrame]:
+        """Return the on-disk copy of a query result if present and within TTL"""
+        if self._cache_dir is None:
+            return None
+        path = self._disk_cache_path(table_name, cache_key)
+        try:
+            age_minutes = (datetime.now().timestamp() - path.stat().st_mtime) / 60
+            if age_minutes >= cache_ttl_minutes:
+                return None
+            df = feather.read_feather(path, memory_map=True)
+            print(f"[DISK CACHE HIT] Using on-disk data for {table_name} (age: {age_minutes:.1f} min)")
+            return df
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"[WARNING] Could not read disk cache for {table_name}: {e}")
+            return None
+    
+    def _write_disk_cache(self, table_name: str, cache_key: str, df: pd.DataFrame):
+        """Write a query result to disk atomically (temp file + rename)"""
+        if self._cache_dir is None:
+            return
+        path = self._disk_cache_path(table_name, cache_key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            feather.write_feather(df, tmp_path, compression='lz4')
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"[WARNING] Could not write disk cache for {table_name}: {e}")
+            tmp_path.unlink(missing_ok=True)
+    
     def list_available_tables(self, refresh: bool = False) -> List[str]:
         """
         List all available tables in the BigQuery dataset
@@ -133,7 +225,11 @@ class BigQueryDataLoader:
         table_name: str, 
         where_clause: Optional[str] = None,
         use_cache: bool = True, 
-        cache_ttl_minutes: int = 60
+        cache_ttl_minutes: int = 60,
+        query_parameters: Optional[Dict[str, str]] = None,
+        limit: Optional[int] = None,
+        columns: Optional[List[str]] = None,
+        order_by: Optional[str] = None
     ) -> pd.DataFrame:
         """
         Load table from BigQuery with optional filtering and caching
@@ -143,6 +239,10 @@ class BigQueryDataLoader:
             where_clause: Optional SQL WHERE clause (without 'WHERE' keyword)
             use_cache: Whether to use cached data if available
             cache_ttl_minutes: Cache time-to-live in minutes
+            query_parameters: Optional STRING values for @name placeholders in where_clause
+            limit: Optional row cap applied in SQL, so only that many rows are transferred
+            columns: Optional column names to select (default: all columns)
+            order_by: Optional SQL ORDER BY expression (without 'ORDER BY' keyword)
             
         Returns:
             DataFrame containing the table data
@@ -156,48 +256,62 @@ class BigQueryDataLoader:
                 "stock_market_data", 
                 where_clause="Symbol = 'AAPL' AND Date >= '2020-01-01'"
             )
+            
+            # Load with a parameterized filter (reuses the query plan across values)
+            df = loader.load_table_from_bigquery(
+                "stock_market_data",
+                where_clause="Symbol = @symbol",
+                query_parameters={"symbol": "AAPL"}
+            )
         """
-        cache_key = self._get_cache_key(table_name, where_clause)
+        cache_key = self._get_cache_key(table_name, where_clause, query_parameters, limit, columns, order_by)
         
         # Check in-memory cache first (fastest)
-        if use_cache and cache_key in self._memory_cache:
-            if self._is_cache_valid(cache_key, cache_ttl_minutes):
-                age_minutes = (datetime.now() - self._cache_metadata[cache_key]).total_seconds() / 60
-                print(f"[CACHE HIT] Using cached data for {table_name} (age: {age_minutes:.1f} min)")
-                return self._memory_cache[cache_key].copy()
-            else:
-                age_minutes = (datetime.now() - self._cache_metadata[cache_key]).total_seconds() / 60
+        if use_cache:
+            with self._inflight_lock:
+                cached = self._memory_cache.get(cache_key)
+                cache_time = self._cache_metadata.get(cache_key)
+            if cached is not None and cache_time is not None:
+                age_minutes = (datetime.now() - cache_time).total_seconds() / 60
+                if age_minutes < cache_ttl_minutes:
+                    print(f"[CACHE HIT] Using cached data for {table_name} (age: {age_minutes:.1f} min)")
+                    return cached.copy()
                 print(f"[CACHE EXPIRED] Cache expired for {table_name} (age: {age_minutes:.1f} min)")
         
+        # Coalesce concurrent requests for the same table/filter onto one query
+        with self._inflight_lock:
+            inflight = self._inflight.get(cache_key)
+            is_owner = inflight is None
+            if is_owner:
+                inflight = Future()
+                self._inflight[cache_key] = inflight
+        
+        if not is_owner:
+            print(f"[COALESCED] Waiting for in-flight load of {table_name}")
+            return inflight.result().copy()
+        
         try:
-            # Build SQL query
-            query = f"""
-            SELECT *
-            FROM `{self.project_id}.{self.dataset_id}.{table_name}`
-            """
-            
-            if where_clause:
-                query += f"\nWHERE {where_clause}"
-            
-            print(f"[LOADING] Loading {table_name} from BigQuery...")
-            if where_clause:
-                print(f"   Filter: {where_clause[:100]}...")
-            
-            # Execute query and load into DataFrame
-            df = self.bq_client.query(query).to_dataframe()
-            
-            print(f"[SUCCESS] Loaded {len(df):,} rows from {table_name}")
-            print(f"   Columns: {len(df.columns)} ({', '.join(list(df.columns)[:5])}...)")
+            # Check the on-disk cache next (survives process restarts)
+            df = self._read_disk_cache(table_name, cache_key, cache_ttl_minutes) if use_cache else None
+            if df is None:
+                df = self._query_table(table_name, where_clause, query_parameters, limit, columns, order_by)
+                if use_cache:
+                    self._write_disk_cache(table_name, cache_key, df)
             
             # Update cache
+            cached = df.copy()
             if use_cache:
-                self._memory_cache[cache_key] = df.copy()
-                self._cache_metadata[cache_key] = datetime.now()
+                with self._inflight_lock:
+                    self._memory_cache[cache_key] = cached
+                    self._cache_metadata[cache_key] = datetime.now()
+                    self._cache_tables[cache_key] = table_name
                 print(f"[CACHED] Cached {table_name} for {cache_ttl_minutes} minutes")
             
+            inflight.set_result(cached)
             return df
             
         except Exception as e:
+            inflight.set_exception(e)
             print(f"[ERROR] Error loading {table_name}: {e}")
             print(f"   Project: {self.project_id}")
             print(f"   Dataset: {self.dataset_id}")
@@ -205,8 +319,126 @@ class BigQueryDataLoader:
             if where_clause:
                 print(f"   WHERE clause: {where_clause}")
             raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(cache_key, None)
     
-    def load_csv_from_gcs(self, filename: str, use_cache: bool = True, cache_ttl_minutes: int = 60) -> pd.DataFrame:
+    def _query_table(
+        self,
+        table_name: str,
+        where_clause: Optional[str],
+        query_parameters: Optional[Dict[str, str]],
+        limit: Optional[int],
+        columns: Optional[List[str]],
+        order_by: Optional[str],
+        as_arrow: bool = False
+    ):
+        """Run the SELECT for load_table_from_bigquery and download the result (DataFrame, or pyarrow.Table if as_arrow)"""
+        # Build SQL query
+        select_list = ", ".join(f"`{col}`" for col in columns) if columns else "*"
+        query = f"""
+        SELECT {select_list}
+        FROM `{self.project_id}.{self.dataset_id}.{table_name}`
+        """
+        
+        if where_clause:
+            query += f"\nWHERE {where_clause}"
+        
+        if order_by:
+            query += f"\nORDER BY {order_by}"
+        
+        if limit:
+            query += f"\nLIMIT {int(limit)}"
+        
+        print(f"[LOADING] Loading {table_name} from BigQuery...")
+        if where_clause:
+            print(f"   Filter: {where_clause[:100]}...")
+        
+        # Execute query and load into DataFrame (or keep the Arrow table)
+        job_config = None
+        if query_parameters:
+            job_config = bigquery.QueryJobConfig(query_parameters=[
+                bigquery.ScalarQueryParameter(name, "STRING", value)
+                for name, value in query_parameters.items()
+            ])
+        job = self.bq_client.query(query, job_config=job_config)
+        if as_arrow:
+            table = job.to_arrow(bqstorage_client=self._get_bqstorage_client())
+            print(f"[SUCCESS] Loaded {table.num_rows:,} rows from {table_name} (Arrow)")
+            print(f"   Columns: {table.num_columns} ({', '.join(table.column_names[:5])}...)")
+            return table
+        df = job.to_dataframe(bqstorage_client=self._get_bqstorage_client())
+        
+        print(f"[SUCCESS] Loaded {len(df):,} rows from {table_name}")
+        print(f"   Columns: {len(df.columns)} ({', '.join(list(df.columns)[:5])}...)")
+        return df
+
+    def load_instruments(
+        self,
+        names: List[str],
+        limit: Optional[int] = None,
+        table_name: str = "30_yr_stock_market_data",
+        use_cache: bool = True,
+        cache_ttl_minutes: int = 60
+    ) -> pd.DataFrame:
+        """
+        Load several instrument columns of the market table in one query
+        
+        Instruments are columns, so N instruments are one scan and one Arrow payload
+        (SELECT Date, `a`, `b`, ...) rather than N single-column queries.
+        
+        Args:
+            names: Instrument column names (e.g., ["Dow Jones", "Gold"])
+            limit: Optional number of most recent dates to return
+            table_name: Market table holding instruments as columns
+            use_cache: Whether to use cached data if available
+            cache_ttl_minutes: Cache time-to-live in minutes
+            
+        Returns:
+            DataFrame indexed by Date (newest first) with one column per instrument
+        """
+        if any("`" in name for name in names):
+            raise ValueError("Instrument names must not contain backticks")
+        
+        df = self.load_table_from_bigquery(
+            table_name,
+            use_cache=use_cache,
+            cache_ttl_minutes=cache_ttl_minutes,
+            limit=limit,
+            columns=["Date", *names],
+            order_by="Date DESC"
+        )
+        return df.set_index("Date")
+    
+    def prefetch(self, *table_names: str, cache_ttl_minutes: int = 60):
+        """
+        Start background loads of tables a tool will need later, so they download
+        while it works on something else. A later load_table_from_bigquery call joins
+        the in-flight query or hits the warmed cache.
+        """
+        for table_name in table_names:
+            cache_key = self._get_cache_key(table_name)
+            with self._inflight_lock:
+                if cache_key in self._inflight:
+                    continue  # Already loading
+                if cache_key in self._memory_cache and self._is_cache_valid(cache_key, cache_ttl_minutes):
+                    continue
+            print(f"[PREFETCH] Loading {table_name} in background")
+            # Daemon thread: never holds up interpreter shutdown, nothing to tear down
+            threading.Thread(
+                target=self._prefetch_table, args=(table_name, cache_ttl_minutes),
+                name=f"bq-prefetch-{table_name}", daemon=True
+            ).start()
+    
+    def _prefetch_table(self, table_name: str, cache_ttl_minutes: int):
+        try:
+            self.load_table_from_bigquery(table_name, cache_ttl_minutes=cache_ttl_minutes)
+        except Exception as e:
+            # The foreground load retries and reports the error to the caller
+            print(f"[PREFETCH] Background load of {table_name} failed: {e}")
+    
+    def load_csv_from_gcs(self, filename: str, use_cache: bool = True, cache_ttl_minutes: int = 60,
+                          as_arrow: bool = False):
         """
         Legacy compatibility method - maps CSV filenames to BigQuery tables
         
@@ -214,9 +446,11 @@ class BigQueryDataLoader:
             filename: CSV filename (will be converted to table name)
             use_cache: Whether to use cached data
             cache_ttl_minutes: Cache TTL in minutes
+            as_arrow: Return the uncached pyarrow.Table straight from the download,
+                skipping pandas conversion (for callers that only need shape/columns)
             
         Returns:
-            DataFrame from BigQuery table
+            DataFrame from BigQuery table (pyarrow.Table if as_arrow)
         """
         # Map common CSV filenames to BigQuery table names (matches actual table names in BigQuery)
         csv_to_table_map = {
@@ -243,21 +477,37 @@ class BigQueryDataLoader:
             table_name = filename.replace(".csv", "").lower()
             print(f"⚠️  No explicit mapping for {filename}, trying table name: {table_name}")
         
+        if as_arrow:
+            return self._query_table(table_name, None, None, None, None, None, as_arrow=True)
+        
         return self.load_table_from_bigquery(table_name, use_cache=use_cache, cache_ttl_minutes=cache_ttl_minutes)
     
     def clear_cache(self, table_name: Optional[str] = None):
-        """Clear cache for specific table or all tables"""
+        """Clear in-memory and on-disk cache for specific table or all tables"""
         if table_name:
             # Clear all cache entries for this table (including filtered versions)
-            keys_to_remove = [k for k in self._memory_cache.keys() if table_name in str(k)]
-            for key in keys_to_remove:
-                self._memory_cache.pop(key, None)
-                self._cache_metadata.pop(key, None)
+            with self._inflight_lock:
+                keys_to_remove = [k for k, t in self._cache_tables.items() if t == table_name]
+                for key in keys_to_remove:
+                    self._memory_cache.pop(key, None)
+                    self._cache_metadata.pop(key, None)
+                    self._cache_tables.pop(key, None)
+            file_re = re.compile(re.escape(table_name) + r"-[0-9a-f]{32}\.feather")
             print(f"[CACHE] Cleared cache for {table_name}")
         else:
-            self._memory_cache.clear()
-            self._cache_metadata.clear()
+            with self._inflight_lock:
+                self._memory_cache.clear()
+                self._cache_metadata.clear()
+                self._cache_tables.clear()
+            file_re = re.compile(r".+-[0-9a-f]{32}\.feather")
             print(f"[CACHE] Cleared all cache")
+        
+        # Only files of the exact {table}-{md5 cache key}.feather shape, so clearing `stock`
+        # leaves `stock-news` (or anything else in the directory) alone
+        if self._cache_dir is not None and self._cache_dir.exists():
+            for path in self._cache_dir.glob("*.feather"):
+                if file_re.fullmatch(path.name):
+                    path.unlink(missing_ok=True)
     
     def get_table_schema(self, table_name: str) -> Dict[str, str]:
         """
@@ -286,6 +536,30 @@ class BigQueryDataLoader:
 # Initialize global loader singleton
 _data_loader = BigQueryDataLoader()
 
+# Date-parsed, date-ordered market table shared by the price and bond tools: (DataFrame, loaded_at)
+_market_data = None
+_market_data_lock = threading.Lock()  # Tools can run concurrently with each other and with prefetch threads
+
+
+def _get_market_data(cache_ttl_minutes: int = 60) -> pd.DataFrame:
+    """
+    Load 30_yr_stock_market_data once with Date parsed and sorted.
+    The frame is shared between calls, so callers must filter or copy before mutating it.
+    """
+    global _market_data
+    with _market_data_lock:
+        if _market_data is not None and (datetime.now() - _market_data[1]).total_seconds() / 60 < cache_ttl_minutes:
+            return _market_data[0]
+        
+        df = _data_loader.load_table_from_bigquery("30_yr_stock_market_data", cache_ttl_minutes=cache_ttl_minutes)
+        if 'Date' in df.columns:
+            df['Date'] = pd.to_datetime(df['Date'])
+            if not df['Date'].is_monotonic_increasing:
+                df = df.sort_values('Date', ignore_index=True)
+        
+        _market_data = (df, datetime.now())
+        return df
+
 
 def list_available_symbols() -> Dict[str, Any]:
     """
@@ -348,6 +622,51 @@ def list_available_symbols() -> Dict[str, Any]:
         }
 
 
+def _price_data_result(df: pd.DataFrame, instrument: Optional[str] = None) -> Dict[str, Any]:
+    """Build the load_price_data response for one instrument (or the overview) from the market frame"""
+    # If specific instrument requested, focus on that column
+    if instrument:
+        # Find matching column (case-insensitive partial match)
+        matching_cols = [col for col in df.columns if instrument.lower() in col.lower()]
+        if matching_cols:
+            selected_col = matching_cols[0]
+            display_df = df[['Date', selected_col]].dropna()
+            result = {
+                "status": "success",
+                "instrument": selected_col,
+                "rows": len(display_df),
+                "date_range": {
+                    "start": str(display_df['Date'].min()),
+                    "end": str(display_df['Date'].max())
+                },
+                "data_preview": sanitize_for_json(display_df.head(10).to_dict('records')),
+                "message": f"Showing data for {selected_col}"
+            }
+        else:
+            result = {
+                "status": "error",
+                "message": f"Instrument '{instrument}' not found",
+                "suggestion": "Use list_available_symbols() to see available instruments",
+                "available_instruments": list(df.columns)
+            }
+    else:
+        # Return summary of all instruments
+        result = {
+            "status": "success",
+            "rows": len(df),
+            "date_range": {
+                "start": str(df['Date'].min()),
+                "end": str(df['Date'].max())
+            },
+            "instruments": [col for col in df.columns if col not in ['Date', 'id']],
+            "instruments_count": len([col for col in df.columns if col not in ['Date', 'id']]),
+            "data_preview": sanitize_for_json(df.head(5).to_dict('records')),
+            "message": "Showing overview of all market instruments. Use list_available_symbols() for categories."
+        }
+    
+    return sanitize_for_json(result)
+
+
 def load_price_data(instrument: Optional[str] = None) -> Dict[str, Any]:
     """
     Load historical market data from BigQuery 30_yr_stock_market_data table
@@ -361,12 +680,8 @@ def load_price_data(instrument: Optional[str] = None) -> Dict[str, Any]:
         Dictionary with status, data preview, and metadata
     """
     try:
-        # Load the full table (instruments are columns, not rows)
-        df = _data_loader.load_table_from_bigquery("30_yr_stock_market_data")
-        
-        # Ensure Date column is datetime
-        if 'Date' in df.columns:
-            df['Date'] = pd.to_datetime(df['Date'])
+        # Load the full table (instruments are columns, not rows), Date already parsed
+        df = _get_market_data()
         
         if len(df) == 0:
             return {
@@ -374,47 +689,41 @@ def load_price_data(instrument: Optional[str] = None) -> Dict[str, Any]:
                 "message": "No data found in table"
             }
         
-        # If specific instrument requested, focus on that column
-        if instrument:
-            # Find matching column (case-insensitive partial match)
-            matching_cols = [col for col in df.columns if instrument.lower() in col.lower()]
-            if matching_cols:
-                selected_col = matching_cols[0]
-                display_df = df[['Date', selected_col]].dropna()
-                result = {
-                    "status": "success",
-                    "instrument": selected_col,
-                    "rows": len(display_df),
-                    "date_range": {
-                        "start": str(display_df['Date'].min()),
-                        "end": str(display_df['Date'].max())
-                    },
-                    "data_preview": sanitize_for_json(display_df.head(10).to_dict('records')),
-                    "message": f"Showing data for {selected_col}"
-                }
-            else:
-                result = {
-                    "status": "error",
-                    "message": f"Instrument '{instrument}' not found",
-                    "suggestion": "Use list_available_symbols() to see available instruments",
-                    "available_instruments": list(df.columns)
-                }
-        else:
-            # Return summary of all instruments
-            result = {
-                "status": "success",
-                "rows": len(df),
-                "date_range": {
-                    "start": str(df['Date'].min()),
-                    "end": str(df['Date'].max())
-                },
-                "instruments": [col for col in df.columns if col not in ['Date', 'id']],
-                "instruments_count": len([col for col in df.columns if col not in ['Date', 'id']]),
-                "data_preview": sanitize_for_json(df.head(5).to_dict('records')),
-                "message": "Showing overview of all market instruments. Use list_available_symbols() for categories."
+        return _price_data_result(df, instrument)
+        
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
+
+
+def load_price_data_many(instruments: List[str]) -> Dict[str, Any]:
+    """
+    Load historical market data for several instruments from one table read
+    
+    The market table holds every instrument as a column, so a batch is served by a
+    single (shared, cached) BigQuery load instead of one load_price_data call each.
+    
+    Args:
+        instruments: Instrument names (e.g., ["Dow Jones", "Gold", "Treasury Yield 10 Years"])
+        
+    Returns:
+        Dictionary with status and per-instrument load_price_data results
+    """
+    try:
+        df = _get_market_data()
+        
+        if len(df) == 0:
+            return {
+                "status": "error",
+                "message": "No data found in table"
             }
         
-        return sanitize_for_json(result)
+        return {
+            "status": "success",
+            "results": {instrument: _price_data_result(df, instrument) for instrument in instruments}
+        }
         
     except Exception as e:
         return {
@@ -473,7 +782,7 @@ def extract_event_dates(event_type: str,
             }
         
         # Parse dates
-        df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
+        df[date_col] = pd.to_datetime(df[date_col], format='ISO8601', errors='coerce', cache=True)
         df = df.dropna(subset=[date_col])
         
         # Filter by symbol if applicable and provided
@@ -546,55 +855,57 @@ def compute_event_impact(symbol: str,
         
         # Ensure Date is datetime and set as index
         df['Date'] = pd.to_datetime(df['Date'])
-        df = df.sort_values('Date')
+        if not df['Date'].is_monotonic_increasing:  # O(n) check; the table is usually stored in date order
+            df = df.sort_values('Date')
         df.set_index('Date', inplace=True)
         
-        # Convert event dates to datetime
-        event_dates_dt = [pd.to_datetime(d) for d in event_dates]
+        # Convert event dates to datetime; unparseable dates are skipped up front
+        event_index = pd.to_datetime(pd.Index(event_dates), format='mixed', errors='coerce')
+        skipped_events = [str(d) for d, ts in zip(event_dates, event_index) if pd.isna(ts)]
+        event_index = event_index[event_index.notna()]
         
         # Compute reactions
         impacts = []
         directions = []
         volatilities = []
         valid_events = []
-        skipped_events = []
-        
-        for event_date in event_dates_dt:
-            try:
-                # Find closest trading days before and after
-                before_date = event_date - pd.Timedelta(days=window_days)
-                after_date = event_date + pd.Timedelta(days=window_days)
-                
-                # Get prices (use closest available dates)
-                before_data = df[df.index <= event_date].iloc[-window_days-1:-1]
-                after_data = df[df.index >= event_date].iloc[1:window_days+1]
-                
-                if len(before_data) == 0 or len(after_data) == 0:
-                    skipped_events.append(str(event_date.date()))
-                    continue
-                
-                price_before = before_data['Close'].iloc[-1]
-                price_after = after_data['Close'].iloc[-1]
-                
-                # Calculate return
-                move = (price_after - price_before) / price_before
-                
-                # Calculate volatility around event
-                event_window = df[(df.index >= before_date) & (df.index <= after_date)]
-                if len(event_window) > 1:
-                    returns = event_window['Close'].pct_change().dropna()
-                    vol = returns.std()
-                else:
-                    vol = 0
-                
-                impacts.append(abs(move))
-                directions.append(move)
-                volatilities.append(vol)
-                valid_events.append(str(event_date.date()))
-                
-            except (KeyError, IndexError) as e:
+        
+        # The index is sorted, so every window is a positional slice; locate all of them at once
+        close = df['Close']
+        close_values = close.to_numpy()
+        n_rows = len(df)
+        through_event = df.index.searchsorted(event_index, side='right')
+        from_event = df.index.searchsorted(event_index, side='left')
+        window_start = df.index.searchsorted(event_index - pd.Timedelta(days=window_days), side='left')
+        window_end = df.index.searchsorted(event_index + pd.Timedelta(days=window_days), side='right')
+        
+        for i, event_date in enumerate(event_index):
+            # Prices: the trading day before the event (up to window_days back)
+            # and up to window_days trading days after it
+            before_start = max(through_event[i] - window_days - 1, 0)
+            after_end = min(from_event[i] + window_days + 1, n_rows)
+            
+            if through_event[i] - 1 <= before_start or after_end <= from_event[i] + 1:
                 skipped_events.append(str(event_date.date()))
                 continue
+            
+            price_before = close_values[through_event[i] - 2]
+            price_after = close_values[after_end - 1]
+            
+            # Calculate return
+            move = (price_after - price_before) / price_before
+            
+            # Calculate volatility around event
+            if window_end[i] - window_start[i] > 1:
+                returns = close.iloc[window_start[i]:window_end[i]].pct_change().dropna()
+                vol = returns.std()
+            else:
+                vol = 0
+            
+            impacts.append(abs(move))
+            directions.append(move)
+            volatilities.append(vol)
+            valid_events.append(str(event_date.date()))
         
         if not impacts:
             return {
@@ -680,7 +991,8 @@ def analyze_market_baseline(symbol: str,
         # Filter for symbol
         df = df[df['Symbol'].str.upper() == symbol.upper()].copy()
         df['Date'] = pd.to_datetime(df['Date'])
-        df = df.sort_values('Date')
+        if not df['Date'].is_monotonic_increasing:
+            df = df.sort_values('Date')
         
         # Filter by date range
         if start_date:
@@ -755,6 +1067,9 @@ def get_comprehensive_event_impact(symbol: str,
         print(f"Date Range: {start_date or 'earliest'} to {end_date or 'latest'}")
     print(f"{'='*70}\n")
     
+    # Market data is needed from step 2 on; download it while events are extracted
+    _data_loader.prefetch("30_yr_stock_market_data")
+    
     # Step 1: Extract event dates
     print("📅 Step 1: Extracting event dates...")
     events = extract_event_dates(event_type, symbol, start_date, end_date)
@@ -857,6 +1172,27 @@ def _generate_recommendation(impact: Dict, baseline: Dict) -> str:
             f"{'Consider hedging strategies.' if severity == 'significant' else 'Monitor for similar patterns.'}")
 
 
+# Bond instrument parameter -> BigQuery column in 30_yr_stock_market_data
+TREASURY_COLUMNS = {
+    "5Y": "Treasury Yield 5 Years __FVX_",
+    "10Y": "Treasury Yield 10 Years __TNX_",
+    "30Y": "Treasury Yield 30 Years __TYX_",
+    "13W": "Treasury Bill 13 Week __IRX_"
+}
+_UNKNOWN_INSTRUMENT_MSG = "Unknown instrument: {}. Available: " + ", ".join(TREASURY_COLUMNS)
+
+# Position sizing multipliers for get_bond_trading_strategy
+RISK_MULTIPLIERS = {
+    "conservative": 0.5,
+    "moderate": 1.0,
+    "aggressive": 1.5
+}
+
+# Recent bond volatility analyses: (instrument, years, threshold, day) -> (result, computed_at)
+_bond_analysis_cache = {}
+BOND_ANALYSIS_TTL_MINUTES = 15
+
+
 def analyze_bond_volatility(instrument: str = "10Y",
                             time_horizon_years: int = 5,
                             confidence_threshold: float = 0.7) -> Dict[str, Any]:
@@ -875,6 +1211,16 @@ def analyze_bond_volatility(instrument: str = "10Y",
         Comprehensive volatility analysis with trading signals
     """
     
+    # One clock read per call: cache key, TTL checks and the analysis window share it
+    now = datetime.now()
+    
+    # Serve repeat requests for the same horizon from the short-TTL cache
+    cache_key = (instrument.upper(), time_horizon_years, confidence_threshold, now.date())
+    cached = _bond_analysis_cache.get(cache_key)
+    if cached and now - cached[1] < timedelta(minutes=BOND_ANALYSIS_TTL_MINUTES):
+        print(f"[CACHE HIT] Reusing {instrument} bond volatility analysis")
+        return copy.deepcopy(cached[0])
+    
     print(f"\n{'='*70}")
     print(f"[BOND ANALYSIS] BOND VOLATILITY ANALYSIS FOR TRADING")
     print(f"{'='*70}")
@@ -885,26 +1231,22 @@ def analyze_bond_volatility(instrument: str = "10Y",
     
     try:
         # Map instrument parameter to actual BigQuery column names
-        treasury_column_map = {
-            "5Y": "Treasury Yield 5 Years __FVX_",
-            "10Y": "Treasury Yield 10 Years __TNX_",
-            "30Y": "Treasury Yield 30 Years __TYX_",
-            "13W": "Treasury Bill 13 Week __IRX_"
-        }
-        
-        treasury_column = treasury_column_map.get(instrument.upper())
+        treasury_column = TREASURY_COLUMNS.get(instrument.upper())
         if not treasury_column:
             return {
                 "status": "error",
-                "message": f"Unknown instrument: {instrument}. Available: 5Y, 10Y, 30Y, 13W"
+                "message": _UNKNOWN_INSTRUMENT_MSG.format(instrument)
             }
         
         # Calculate date range
-        end_date = datetime.now()
+        end_date = now
         start_date = end_date - timedelta(days=time_horizon_years * 365)
         
         print(f"[DATE] Analysis Period: {start_date.date()} to {end_date.date()}")
         
+        # Download market data in the background while Fed communications load
+        _data_loader.prefetch("30_yr_stock_market_data")
+        
         # Load Fed communications for monetary policy events (cached)
         df_fed = _data_loader.load_table_from_bigquery("communications")
         
@@ -916,7 +1258,7 @@ def analyze_bond_volatility(instrument: str = "10Y",
                 break
         
         if date_col_fed:
-            df_fed[date_col_fed] = pd.to_datetime(df_fed[date_col_fed], errors='coerce')
+            df_fed[date_col_fed] = pd.to_datetime(df_fed[date_col_fed], format='ISO8601', errors='coerce', cache=True)
             df_fed = df_fed.dropna(subset=[date_col_fed])
             fed_dates = df_fed[(df_fed[date_col_fed] >= start_date) & 
                               (df_fed[date_col_fed] <= end_date)][date_col_fed].tolist()
@@ -925,13 +1267,9 @@ def analyze_bond_volatility(instrument: str = "10Y",
         
         print(f"[FED] Found {len(fed_dates)} Fed announcements in period")
         
-        # Load market data (instruments are COLUMNS in this table)
-        df_market = _data_loader.load_table_from_bigquery("30_yr_stock_market_data")
-        
-        # Ensure Date column is datetime
-        df_market['Date'] = pd.to_datetime(df_market['Date'])
-        df_market = df_market.sort_values('Date')
-        df_market = df_market[(df_market['Date'] >= start_date) & (df_market['Date'] <= end_date)]
+        # Load market data (instruments are COLUMNS in this table), already date-ordered
+        df_market = _get_market_data()
+        df_market = df_market[(df_market['Date'] >= start_date) & (df_market['Date'] <= end_date)].copy()
         
         if len(df_market) < 30:
             return {
@@ -966,37 +1304,38 @@ def analyze_bond_volatility(instrument: str = "10Y",
             }
         
         # Identify high volatility periods
-        volatility_mean = df_market['Treasury_Volatility'].mean()
-        volatility_std = df_market['Treasury_Volatility'].std()
+        # Reductions run on the raw float array (no NaN left after dropna)
+        vol_values = df_market['Treasury_Volatility'].to_numpy(dtype=np.float64)
+        volatility_mean = vol_values.mean()
+        volatility_std = vol_values.std(ddof=1)
         high_vol_threshold = volatility_mean + volatility_std
         
-        high_vol_periods = df_market[df_market['Treasury_Volatility'] > high_vol_threshold]
+        high_vol_days = int(np.count_nonzero(vol_values > high_vol_threshold))
         
         print(f"[VOLATILITY] Volatility Analysis:")
         print(f"   Mean Volatility: {volatility_mean*100:.2f}%")
         print(f"   Std Dev: {volatility_std*100:.2f}%")
         print(f"   High Vol Threshold: {high_vol_threshold*100:.2f}%")
-        print(f"   High Vol Days: {len(high_vol_periods)} ({len(high_vol_periods)/len(df_market)*100:.1f}%)")
+        print(f"   High Vol Days: {high_vol_days} ({high_vol_days/len(df_market)*100:.1f}%)")
         
         # Analyze event-driven volatility
-        event_volatilities = []
-        for fed_date in fed_dates:
-            try:
-                fed_date = pd.to_datetime(fed_date)
-                # Get volatility in 5-day window around event
-                window_data = df_market[(df_market['Date'] >= fed_date - pd.Timedelta(days=5)) & 
-                                       (df_market['Date'] <= fed_date + pd.Timedelta(days=5))]
-                if len(window_data) > 0:
-                    avg_vol = window_data['Treasury_Volatility'].mean()
-                    if not np.isnan(avg_vol):
-                        event_volatilities.append(avg_vol)
-            except:
-                continue
+        # Dates are sorted, so each 5-day window around an event is a searchsorted slice
+        market_dates = df_market['Date'].to_numpy()
+        vol_cumsum = np.concatenate(([0.0], np.cumsum(df_market['Treasury_Volatility'].to_numpy())))
+        event_dates = np.array(fed_dates, dtype='datetime64[ns]').astype(market_dates.dtype)
+        window = np.timedelta64(5, 'D')
+        window_start = np.searchsorted(market_dates, event_dates - window, side='left')
+        window_end = np.searchsorted(market_dates, event_dates + window, side='right')
+        has_data = window_end > window_start
+        event_volatilities = (
+            (vol_cumsum[window_end] - vol_cumsum[window_start])[has_data] / (window_end - window_start)[has_data]
+        ).tolist()
         
         avg_event_volatility = np.mean(event_volatilities) if event_volatilities else volatility_mean
         
         # Calculate current volatility (last 30 days)
-        current_volatility = df_market['Treasury_Volatility'].iloc[-1] if not np.isnan(df_market['Treasury_Volatility'].iloc[-1]) else volatility_mean
+        latest_vol = vol_values[-1]
+        current_volatility = latest_vol if not np.isnan(latest_vol) else volatility_mean
         
         # Get current treasury yield for context
         current_yield = df_market[treasury_column].iloc[-1]
@@ -1006,7 +1345,10 @@ def analyze_bond_volatility(instrument: str = "10Y",
         print(f"   Average Event Volatility: {avg_event_volatility*100:.2f}%")
         
         # Generate trading signal
-        vol_percentile = (df_market['Treasury_Volatility'].rank(pct=True).iloc[-1]) * 100
+        # Percentile of the latest reading, same as rank(pct=True) (average ties) without ranking every row
+        vol_percentile = (
+            np.count_nonzero(vol_values < latest_vol) + (np.count_nonzero(vol_values == latest_vol) + 1) / 2
+        ) / len(vol_values) * 100
         
         # Trading logic for bonds: High volatility = opportunity for volatility trades
         if current_volatility > high_vol_threshold:
@@ -1056,12 +1398,12 @@ def analyze_bond_volatility(instrument: str = "10Y",
                 "years": time_horizon_years
             },
             "volatility_metrics": {
-                "current_volatility": round(current_volatility * 100, 2),
-                "mean_volatility": round(volatility_mean * 100, 2),
-                "volatility_std": round(volatility_std * 100, 2),
-                "high_vol_threshold": round(high_vol_threshold * 100, 2),
-                "volatility_percentile": round(vol_percentile, 1),
-                "avg_event_volatility": round(avg_event_volatility * 100, 2)
+                "current_volatility": _json_float(current_volatility * 100, 2),
+                "mean_volatility": _json_float(volatility_mean * 100, 2),
+                "volatility_std": _json_float(volatility_std * 100, 2),
+                "high_vol_threshold": _json_float(high_vol_threshold * 100, 2),
+                "volatility_percentile": _json_float(vol_percentile, 1),
+                "avg_event_volatility": _json_float(avg_event_volatility * 100, 2)
             },
             "event_analysis": {
                 "fed_announcements_analyzed": len(fed_dates),
@@ -1070,29 +1412,34 @@ def analyze_bond_volatility(instrument: str = "10Y",
             "trading_signal": {
                 "signal": signal,
                 "strength": signal_strength,
-                "confidence": round(overall_confidence, 3),
+                "confidence": _json_float(overall_confidence, 3),
                 "confidence_percentage": f"{round(overall_confidence * 100, 1)}%",
                 "recommendation_status": recommendation_status,
                 "rationale": rationale
             },
             "confidence_breakdown": {
-                "data_completeness": round(sample_confidence, 3),
-                "event_coverage": round(event_coverage, 3),
-                "volatility_consistency": round(volatility_consistency, 3),
-                "overall_confidence": round(overall_confidence, 3)
+                "data_completeness": _json_float(sample_confidence, 3),
+                "event_coverage": _json_float(event_coverage, 3),
+                "volatility_consistency": _json_float(volatility_consistency, 3),
+                "overall_confidence": _json_float(overall_confidence, 3)
             },
             "recommendation": recommendation,
-            "current_yield": round(current_yield, 3),
+            "current_yield": _json_float(current_yield, 3),
             "market_context": {
                 "data_source": "Treasury Yield Changes",
                 "treasury_column": treasury_column,
                 "data_points": len(df_market),
-                "high_volatility_periods": len(high_vol_periods),
-                "high_vol_percentage": f"{len(high_vol_periods)/len(df_market)*100:.1f}%"
+                "high_volatility_periods": high_vol_days,
+                "high_vol_percentage": f"{high_vol_days/len(df_market)*100:.1f}%"
             },
             "risk_disclaimer": "This analysis is based on historical data and statistical patterns. Past volatility does not guarantee future results. Always consider current market conditions, portfolio objectives, and risk tolerance before trading."
         }
-        return sanitize_for_json(result)
+        
+        # Drop expired entries, then cache this analysis
+        for key in [k for k, (_, ts) in _bond_analysis_cache.items() if now - ts >= timedelta(minutes=BOND_ANALYSIS_TTL_MINUTES)]:
+            del _bond_analysis_cache[key]
+        _bond_analysis_cache[cache_key] = (copy.deepcopy(result), now)
+        return result
         
     except Exception as e:
         import traceback
@@ -1132,13 +1479,7 @@ def get_bond_trading_strategy(instrument: str = "10Y",
     mean_vol = vol_analysis['volatility_metrics']['mean_volatility']
     
     # Risk-adjusted position sizing
-    risk_multipliers = {
-        "conservative": 0.5,
-        "moderate": 1.0,
-        "aggressive": 1.5
-    }
-    
-    position_size_multiplier = risk_multipliers.get(risk_appetite.lower(), 1.0)
+    position_size_multiplier = RISK_MULTIPLIERS.get(risk_appetite.lower(), 1.0)
     
     # Generate specific trade ideas
     strategies = []
@@ -5,20 +5,89 @@ Supports BigQuery and GCS with persistent memory.
 """
 
 import pandas as pd
+import numpy as np
+import pyarrow as pa
 import gcsfs
 from google.cloud import bigquery
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Callable, Tuple, Union
 import re
+import sys
 import json
+import time
+import hashlib
+import random
 from pathlib import Path
-from collections import defaultdict
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from datetime import datetime
 
 from app.config import config
 
+# Use orjson for the memory snapshot when available (much faster on large caches)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Datetimes go through _json_default like the json fallback, so output does not depend on orjson
+ORJSON_MEMORY_OPTIONS = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_SERIALIZE_NUMPY) if orjson else 0
+
 # Import BigQueryDataLoader from event_impact_agent
 from app.sub_agents.event_impact_agent.tools import _data_loader as bq_loader
 
+# Fixed label vocabulary so sentiment counts are a bincount over category codes
+SENTIMENT_LABELS = ['negative', 'neutral', 'positive']
+SENTIMENT_LABEL_DTYPE = pd.CategoricalDtype(categories=SENTIMENT_LABELS)
+
+# A table's date column as a DATE, whatever its stored type, for parameterized range filters
+DATE_COLUMN_SQL = "SAFE_CAST(SUBSTR(CAST(date AS STRING), 1, 10) AS DATE)"
+
+# Heavily repeated string columns stored as categoricals (cheaper nunique/counts/filters)
+CATEGORICAL_COLUMNS = ('stock', '_source_table', '_source_type')
+
+# Analyst title keywords
+UPGRADE_KEYWORDS = ('upgrade', 'raise', 'outperform', 'buy', 'beat', 'higher', 'positive')
+DOWNGRADE_KEYWORDS = ('downgrade', 'lower', 'cut', 'sell', 'miss', 'underperform', 'negative')
+# Compiled once; case-insensitive so vectorized scans skip a lowercasing pass
+UPGRADE_RE = re.compile('|'.join(map(re.escape, UPGRADE_KEYWORDS)), re.IGNORECASE)
+DOWNGRADE_RE = re.compile('|'.join(map(re.escape, DOWNGRADE_KEYWORDS)), re.IGNORECASE)
+
+
+def _json_default(obj):
+    """Memory JSON fallback encoder: NumPy values as plain numbers/lists, anything else via str()"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    return str(obj)
+
+
+def _records_to_frame(rows: List[dict]) -> pd.DataFrame:
+    """
+    Build a DataFrame from cached row dicts through Arrow's columnar ingestion.
+    Falls back to the pandas constructor for rows Arrow cannot type (mixed columns).
+    Columns come back as regular NumPy/object dtypes, matching fresh BigQuery frames,
+    so the tools behave the same on cache hits.
+    """
+    if not rows:
+        return pd.DataFrame()
+    try:
+        return pa.Table.from_pylist(rows).to_pandas()
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pd.DataFrame(rows)
+
+
+def _frame_to_records(df: pd.DataFrame) -> List[dict]:
+    """
+    Convert a DataFrame to row dicts through Arrow (inverse of _records_to_frame).
+    Missing values come out as None rather than NaN, so the rows stay valid JSON.
+    """
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False).to_pylist()
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return df.to_dict(orient='records')
+
 
 class PersistentMemoryStore:
     """
@@ -27,6 +96,11 @@ class PersistentMemoryStore:
     Optimized for low-latency access with in-memory caching.
     """
     
+    # atexit is unreliable with gcsfs, so the snapshot is saved every few operations
+    SAVE_EVERY_OPS = 3
+    # Bound on the fast in-process cache (LRU); query_cache itself is bounded by TTL eviction
+    MAX_FAST_CACHE_ENTRIES = 10_000
+    
     def __init__(self):
         """Initialize persistent memory with GCS backing"""
         # Debug: Print bucket configuration
@@ -41,12 +115,63 @@ class PersistentMemoryStore:
             print(f"   Memory file: {self.memory_file}")
         
         self.memory = self._load_memory()
-        self._in_memory_cache = {}  # Fast access cache
+        self._in_memory_cache = OrderedDict()  # Fast access cache (LRU order)
+        for entries in self.memory.get("analyzed_tickers", {}).values():
+            for entry in entries:
+                self._intern_entry(entry)
         self._dirty = False  # Track if memory needs saving
         self._operations_since_save = 0  # Track operations for periodic saves
         
         # Note: atexit is unreliable with gcsfs due to thread pool shutdown
-        # Instead, we save frequently (every 3 ops) during normal operation
+        # Instead, we save frequently (every SAVE_EVERY_OPS ops) during normal operation
+    
+    @staticmethod
+    def _intern_entry(entry: dict) -> dict:
+        """Share one string object per source name / sentiment label across all stored analyses"""
+        entry["sources"] = [sys.intern(s) if type(s) is str else s for s in entry.get("sources", [])]
+        analysis = entry.get("analysis")
+        for section in (analysis, analysis.get("result") if isinstance(analysis, dict) else None):
+            if isinstance(section, dict):
+                for field in ("ticker", "sentiment", "overall_sentiment"):
+                    if type(section.get(field)) is str:
+                        section[field] = sys.intern(section[field])
+        return entry
+    
+    def _apply_operation(self, op: str, data: dict):
+        """Apply one recorded operation to the in-memory store"""
+        if op == "analysis":
+            ticker = sys.intern(data["ticker"])
+            self.memory["analyzed_tickers"].setdefault(ticker, []).append(self._intern_entry(data["entry"]))
+            self.memory["statistics"]["unique_tickers_analyzed"] = len(self.memory["analyzed_tickers"])
+        elif op == "cache":
+            self.memory["query_cache"][data["key"]] = data["entry"]
+            self._remember(data["key"], data["entry"])
+        elif op == "insight":
+            self.memory["insights"].append(data["entry"])
+    
+    def _record_operations(self, records: List[tuple]):
+        """Apply (op, data) operations and save once if they cross the periodic-save threshold"""
+        for op, data in records:
+            self._apply_operation(op, data)
+        self._dirty = True
+        self._operations_since_save += len(records)
+        
+        # Save every few operations for more aggressive persistence
+        # This reduces risk of data loss since atexit is unreliable with gcsfs
+        if self._operations_since_save >= self.SAVE_EVERY_OPS:
+            self.save_memory()
+    
+    def _serialize(self) -> bytes:
+        """Snapshot of the whole memory as JSON bytes"""
+        self._evict_expired()
+        self.memory["last_updated"] = datetime.now().isoformat()
+        if orjson:
+            return orjson.dumps(
+                self.memory,
+                option=orjson.OPT_INDENT_2 | ORJSON_MEMORY_OPTIONS,
+                default=_json_default
+            )
+        return json.dumps(self.memory, indent=2, default=_json_default).encode()
     
     def _load_memory(self) -> dict:
         """Load memory from GCS with fallback"""
@@ -63,8 +188,8 @@ class PersistentMemoryStore:
         try:
             print(f"[MEMORY] Checking for existing memory at: {self.memory_file}")
             if self.fs.exists(self.memory_file):
-                with self.fs.open(self.memory_file, 'r') as f:
-                    memory = json.load(f)
+                with self.fs.open(self.memory_file, 'rb') as f:
+                    memory = orjson.loads(f.read()) if orjson else json.load(f)
                     print(f"[SUCCESS] Loaded persistent memory from GCS")
                     print(f"   Tickers analyzed: {len(memory.get('analyzed_tickers', {}))}")
                     print(f"   Total queries: {memory.get('statistics', {}).get('total_queries', 0)}")
@@ -111,10 +236,10 @@ class PersistentMemoryStore:
             return  # No persistence available
         
         try:
-            self.memory["last_updated"] = datetime.now().isoformat()
             print(f"💾 Saving memory to GCS: {self.memory_file}")
-            with self.fs.open(self.memory_file, 'w') as f:
-                json.dump(self.memory, f, indent=2)
+            payload = self._serialize()
+            with self.fs.open(self.memory_file, 'wb') as f:
+                f.write(payload)
             self._dirty = False
             self._operations_since_save = 0  # Reset counter after successful save
             print(f"[SUCCESS] Memory persisted successfully ({len(self.memory.get('analyzed_tickers', {}))} tickers)")
@@ -131,75 +256,147 @@ class PersistentMemoryStore:
             print(f"[WARNING] Failed to save memory: {e}")
             print(f"   Type: {type(e).__name__}")
     
-    def add_analysis(self, ticker: str, analysis: dict):
-        """Add ticker analysis to memory with source tracking"""
-        if ticker not in self.memory["analyzed_tickers"]:
-            self.memory["analyzed_tickers"][ticker] = []
-        
+    def _analysis_record(self, ticker: str, analysis: dict) -> tuple:
         entry = {
             "timestamp": datetime.now().isoformat(),
             "analysis": analysis,
             "sources": analysis.get("data_sources", [])
         }
-        
-        self.memory["analyzed_tickers"][ticker].append(entry)
-        self.memory["statistics"]["unique_tickers_analyzed"] = len(self.memory["analyzed_tickers"])
-        self._dirty = True
-        self._operations_since_save += 1
-        
-        # Save every 3 operations for more aggressive persistence
-        # This reduces risk of data loss since atexit is unreliable with gcsfs
-        if self._operations_since_save >= 3:
-            self.save_memory()
+        return "analysis", {"ticker": ticker, "entry": entry}
+    
+    def _sample_ttl(self, ttl_minutes: Union[float, Tuple[float, float], Callable[[], float]]) -> float:
+        """Pick a TTL: uniform within a (min, max) range, a callable's value, or a scalar as given"""
+        if callable(ttl_minutes):
+            return float(ttl_minutes())
+        if isinstance(ttl_minutes, (tuple, list)):
+            return random.uniform(*ttl_minutes)
+        return float(ttl_minutes)
+    
+    def _cache_record(self, query_key: str, result: dict,
+                      ttl_minutes: Union[float, Tuple[float, float], Callable[[], float]] = 60) -> tuple:
+        ttl = self._sample_ttl(ttl_minutes)
+        cache_entry = {
+            "result": result,
+            "cached_at": datetime.now().isoformat(),
+            "ttl_minutes": round(ttl, 2),
+            "expires_at": time.time() + ttl * 60
+        }
+        return "cache", {"key": query_key, "entry": cache_entry}
+    
+    def _insight_record(self, insight: str, category: str = "general", metadata: dict = None) -> tuple:
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "category": category,
+            "insight": insight,
+            "metadata": metadata or {}
+        }
+        return "insight", {"entry": entry}
+    
+    def add_analysis(self, ticker: str, analysis: dict):
+        """Add ticker analysis to memory with source tracking"""
+        self._record_operations([self._analysis_record(ticker, analysis)])
+    
+    @staticmethod
+    def _entry_expires_at(entry: dict) -> float:
+        expires_at = entry.get("expires_at")
+        if expires_at is None:
+            # Entries persisted before expires_at existed: derive it from cached_at + ttl
+            try:
+                cached_at = datetime.fromisoformat(entry["cached_at"]).timestamp()
+                expires_at = cached_at + entry.get("ttl_minutes", 60) * 60
+            except (KeyError, TypeError, ValueError):
+                return np.inf
+        return expires_at
+    
+    def _is_expired(self, entry: dict) -> bool:
+        return time.time() >= self._entry_expires_at(entry)
+    
+    def _evict_expired(self) -> int:
+        """Drop every query-cache entry past its TTL; returns how many were evicted"""
+        now = time.time()
+        query_cache = self.memory["query_cache"]
+        live = {key: entry for key, entry in query_cache.items() if self._entry_expires_at(entry) > now}
+        expired = len(query_cache) - len(live)
+        if not expired:
+            return 0
+        
+        for key in query_cache.keys() - live.keys():
+            self._in_memory_cache.pop(key, None)
+        self.memory["query_cache"] = live
+        stats = self.memory["statistics"]
+        stats["cache_entries_pruned"] = stats.get("cache_entries_pruned", 0) + expired
+        print(f"[MEMORY] Evicted {expired} expired cached queries")
+        return expired
+    
+    def _remember(self, query_key: str, entry: dict):
+        """Put an entry in the fast cache, evicting the least recently used beyond the bound"""
+        self._in_memory_cache[query_key] = entry
+        self._in_memory_cache.move_to_end(query_key)
+        while len(self._in_memory_cache) > self.MAX_FAST_CACHE_ENTRIES:
+            self._in_memory_cache.popitem(last=False)
     
     def get_cached_query(self, query_key: str) -> Optional[dict]:
-        """Get cached query result for low latency"""
+        """Get cached query result for low latency (None if missing or past its TTL)"""
         # Check in-memory first (fastest)
         if query_key in self._in_memory_cache:
+            entry = self._in_memory_cache[query_key]
+            if self._is_expired(entry):
+                self._in_memory_cache.pop(query_key, None)
+                self.memory["query_cache"].pop(query_key, None)
+                return None
+            self._in_memory_cache.move_to_end(query_key)
             self.memory["statistics"]["cache_hits"] += 1
-            return self._in_memory_cache[query_key]
+            return entry
         
         # Check persistent cache
         if query_key in self.memory.get("query_cache", {}):
             result = self.memory["query_cache"][query_key]
-            self._in_memory_cache[query_key] = result  # Promote to fast cache
+            if self._is_expired(result):
+                self.memory["query_cache"].pop(query_key, None)
+                return None
+            self._remember(query_key, result)  # Promote to fast cache
             self.memory["statistics"]["cache_hits"] += 1
             return result
         
         return None
     
-    def cache_query(self, query_key: str, result: dict, ttl_minutes: int = 60):
-        """Cache query result with TTL"""
-        cache_entry = {
-            "result": result,
-            "cached_at": datetime.now().isoformat(),
-            "ttl_minutes": ttl_minutes
-        }
-        
-        self.memory["query_cache"][query_key] = cache_entry
-        self._in_memory_cache[query_key] = cache_entry
-        self._dirty = True
-        self._operations_since_save += 1
+    def cache_query(self, query_key: str, result: dict,
+                    ttl_minutes: Union[float, Tuple[float, float], Callable[[], float]] = 60):
+        """
+        Cache query result with TTL.
         
-        # Save every 3 operations for more aggressive persistence
-        if self._operations_since_save >= 3:
-            self.save_memory()
+        ttl_minutes may be a scalar (used exactly), a (min, max) range sampled uniformly,
+        or a callable returning minutes; the latter two let entries cached together expire
+        spread over a window instead of all at once.
+        """
+        self._record_operations([self._cache_record(query_key, result, ttl_minutes)])
     
     def add_insight(self, insight: str, category: str = "general", metadata: dict = None):
         """Store an insight with metadata"""
-        entry = {
-            "timestamp": datetime.now().isoformat(),
-            "category": category,
-            "insight": insight,
-            "metadata": metadata or {}
-        }
-        self.memory["insights"].append(entry)
-        self._dirty = True
-        self._operations_since_save += 1
+        self._record_operations([self._insight_record(insight, category, metadata)])
+    
+    def save_many(self, entries: List[tuple]):
+        """
+        Record several operations with at most one snapshot upload.
         
-        # Save every 3 operations for more aggressive persistence
-        if self._operations_since_save >= 3:
-            self.save_memory()
+        Entries are tuples of the matching method's arguments, prefixed by the type:
+            ("analysis", ticker, analysis)
+            ("cache", query_key, result[, ttl_minutes])
+            ("insight", insight[, category[, metadata]])
+        """
+        builders = {
+            "analysis": self._analysis_record,
+            "cache": self._cache_record,
+            "insight": self._insight_record
+        }
+        records = [builders[op](*args) for op, *args in entries]
+        if records:
+            self._record_operations(records)
+    
+    def cleanup(self):
+        """Upload pending operations to GCS; call on shutdown while gcsfs threads are still alive"""
+        if self._dirty:
+            self.save_memory(force=True)
     
     def get_ticker_history(self, ticker: str) -> List[dict]:
         """Get all historical analyses for a ticker"""
@@ -409,6 +606,85 @@ class SentimentDataStore:
         
         return tables
     
+    def has_ticker(self, ticker: str, include_transcripts: bool = True) -> bool:
+        """
+        Whether any sentiment table has rows for the ticker, from one-row LIMIT 1 lookups.
+        A table that cannot be checked is logged and counted as a possible match,
+        so callers fall back to their regular queries.
+        """
+        ticker = ticker.upper()
+        kinds = ['news', 'analyst'] + (['transcripts'] if include_transcripts else [])
+        for kind in kinds:
+            for table_name in self.file_catalog['sentiment_sources'][kind]:
+                try:
+                    df = self.bq_loader.load_table_from_bigquery(
+                        table_name, where_clause="UPPER(stock) = @ticker",
+                        query_parameters={'ticker': ticker}, limit=1, columns=['stock']
+                    )
+                except Exception as e:
+                    print(f"[WARNING] Could not check {table_name} for {ticker}: {e}")
+                    return True
+                if not df.empty:
+                    return True
+        return False
+    
+    def _load_table_for_query(self, table_name: str, filters: Dict, max_rows: Optional[int]) -> Optional[pd.DataFrame]:
+        """Load one table for smart_query with filters applied; None if empty or unreadable"""
+        try:
+            # Build WHERE clause based on filters
+            where_conditions = []
+            query_parameters = {}
+            
+            if filters:
+                # Filter by ticker/stock (most common column names)
+                if 'ticker' in filters:
+                    query_parameters['ticker'] = filters['ticker'].upper()
+                    where_conditions.append("(UPPER(stock) = @ticker OR UPPER(Stock) = @ticker OR UPPER(ticker) = @ticker OR UPPER(Symbol) = @ticker)")
+                
+                # Filter by date range; the date column is STRING, DATE or TIMESTAMP depending on
+                # the table, so compare its leading YYYY-MM-DD as a DATE (names are case-insensitive)
+                if 'start_date' in filters:
+                    query_parameters['start_date'] = str(filters['start_date'])
+                    where_conditions.append(f"{DATE_COLUMN_SQL} >= SAFE_CAST(@start_date AS DATE)")
+                
+                if 'end_date' in filters:
+                    query_parameters['end_date'] = str(filters['end_date'])
+                    where_conditions.append(f"{DATE_COLUMN_SQL} <= SAFE_CAST(@end_date AS DATE)")
+                
+                # Filter by sentiment
+                if 'sentiment' in filters:
+                    query_parameters['sentiment'] = filters['sentiment'].lower()
+                    where_conditions.append("(LOWER(label) = @sentiment OR LOWER(sentiment) = @sentiment)")
+            
+            where_clause = " AND ".join(where_conditions) if where_conditions else None
+            
+            # Load data from BigQuery with optional filtering
+            df = self.bq_loader.load_table_from_bigquery(
+                table_name, where_clause=where_clause, query_parameters=query_parameters or None,
+                limit=max_rows
+            )
+            
+            if max_rows and len(df) > max_rows:
+                df = df.head(max_rows)
+            
+            if df.empty:
+                return None
+            
+            # Add source tracking
+            df['_source_table'] = table_name
+            df['_source_type'] = 'bigquery'
+            if 'label' in df.columns:
+                df['label'] = _to_sentiment_labels(df['label'], table_name)
+            for col in CATEGORICAL_COLUMNS:
+                if col in df.columns:
+                    df[col] = df[col].astype('category')
+            print(f"  ✓ Loaded {len(df)} rows from {table_name}")
+            return df
+                
+        except Exception as e:
+            print(f"  [ERROR] Error reading {table_name}: {e}")
+            return None
+    
     def smart_query(self, intent: str, filters: Optional[Dict] = None, max_rows: Optional[int] = None) -> pd.DataFrame:
         """
         Intelligently query data based on intent with caching for low latency.
@@ -426,14 +702,15 @@ class SentimentDataStore:
         filters = filters or {}
         
         # Generate cache key for this query
-        cache_key = f"{intent}_{json.dumps(filters, sort_keys=True)}_{max_rows}"
+        filters_key = orjson.dumps(filters, option=orjson.OPT_SORT_KEYS).decode() if orjson else json.dumps(filters, sort_keys=True)
+        cache_key = f"{intent}_{filters_key}_{max_rows}"
         
         # Check cache for low-latency access
         cached_result = self.memory.get_cached_query(cache_key)
         if cached_result and cached_result.get("result"):
             print(f"[CACHE HIT] Cache hit! Returning cached data (query #{self._query_count})")
             # Return cached DataFrame
-            return pd.DataFrame(cached_result["result"].get("data", []))
+            return _records_to_frame(cached_result["result"].get("data", []))
         
         relevant_tables = self.get_tables_for_intent(intent)
         
@@ -443,61 +720,24 @@ class SentimentDataStore:
         
         print(f"[QUERY] Querying {len(relevant_tables)} table(s) for intent: {intent} (query #{self._query_count})")
         
-        all_data = []
-        sources_used = []
+        # Tables are independent BigQuery round-trips, so fetch them concurrently
+        if len(relevant_tables) > 1:
+            with ThreadPoolExecutor(max_workers=min(len(relevant_tables), 8)) as pool:
+                frames = list(pool.map(lambda t: self._load_table_for_query(t, filters, max_rows), relevant_tables))
+        else:
+            frames = [self._load_table_for_query(relevant_tables[0], filters, max_rows)]
         
-        for table_name in relevant_tables:
-            try:
-                # Build WHERE clause based on filters
-                where_conditions = []
-                
-                if filters:
-                    # Filter by ticker/stock (most common column names)
-                    if 'ticker' in filters:
-                        ticker = filters['ticker'].upper()
-                        where_conditions.append(f"(UPPER(stock) = '{ticker}' OR UPPER(Stock) = '{ticker}' OR UPPER(ticker) = '{ticker}' OR UPPER(Symbol) = '{ticker}')")
-                    
-                    # Filter by date range
-                    if 'start_date' in filters:
-                        where_conditions.append(f"(date >= '{filters['start_date']}' OR Date >= '{filters['start_date']}')")
-                    
-                    if 'end_date' in filters:
-                        where_conditions.append(f"(date <= '{filters['end_date']}' OR Date <= '{filters['end_date']}')")
-                    
-                    # Filter by sentiment
-                    if 'sentiment' in filters:
-                        sentiment_val = filters['sentiment'].lower()
-                        where_conditions.append(f"(LOWER(label) = '{sentiment_val}' OR LOWER(sentiment) = '{sentiment_val}')")
-                
-                where_clause = " AND ".join(where_conditions) if where_conditions else None
-                
-                # Load data from BigQuery with optional filtering
-                df = self.bq_loader.load_table_from_bigquery(table_name, where_clause=where_clause)
-                
-                if max_rows and len(df) > max_rows:
-                    df = df.head(max_rows)
-                
-                if df.empty:
-                    continue
-                
-                # Add source tracking
-                df['_source_table'] = table_name
-                df['_source_type'] = 'bigquery'
-                all_data.append(df)
-                sources_used.append(table_name)
-                print(f"  ✓ Loaded {len(df)} rows from {table_name}")
-                    
-            except Exception as e:
-                print(f"  [ERROR] Error reading {table_name}: {e}")
+        all_data = [df for df in frames if df is not None]
+        sources_used = [t for t, df in zip(relevant_tables, frames) if df is not None]
         
         if all_data:
             result = pd.concat(all_data, ignore_index=True)
-            print(f"📊 Total: {len(result)} rows from {result['_source_file'].nunique()} file(s)")
+            print(f"📊 Total: {len(result)} rows from {len(sources_used)} table(s)")
             
             # Cache result for future low-latency access
             # Store limited data to keep cache size manageable
             cache_data = {
-                "data": result.head(1000).to_dict(orient='records'),  # Cache first 1000 rows
+                "data": _frame_to_records(result.head(1000)),  # Cache first 1000 rows
                 "total_rows": len(result),
                 "sources": sources_used,
                 "intent": intent
@@ -510,6 +750,85 @@ class SentimentDataStore:
         return pd.DataFrame()
 
 
+_iso_second = (0, "")  # (epoch second, ISO string) of the last formatted timestamp
+
+
+def _now_iso() -> str:
+    """Current local time as ISO-8601, formatted at most once per wall-clock second"""
+    global _iso_second
+    sec = int(time.time())
+    if sec != _iso_second[0]:
+        _iso_second = (sec, datetime.fromtimestamp(sec).isoformat())
+    return _iso_second[1]
+
+
+def _head_list(df: pd.DataFrame, col: str, n: int) -> list:
+    """First ``n`` values of a column as a plain list (empty if the column is missing)"""
+    return df[col].to_numpy()[:n].tolist() if col in df.columns else []
+
+
+def _to_sentiment_labels(labels: pd.Series, source: str = "labels") -> pd.Series:
+    """
+    Cast labels to the fixed sentiment categorical, normalizing case and whitespace first.
+    Labels still outside the vocabulary become NaN and are reported rather than dropped silently.
+    """
+    normalized = labels.astype('string').str.strip().str.lower()
+    categorical = normalized.astype(SENTIMENT_LABEL_DTYPE)
+    unknown = normalized[normalized.notna() & categorical.isna()]
+    if len(unknown):
+        examples = ', '.join(map(repr, unknown.value_counts().index[:5]))
+        print(f"[WARNING] {len(unknown)} sentiment label(s) in {source} outside "
+              f"{SENTIMENT_LABELS}, left uncounted: {examples}")
+    return categorical
+
+
+def _label_counts(df: pd.DataFrame) -> Dict[str, int]:
+    """
+    Sentiment label counts via np.bincount over the categorical codes.
+    Same shape as value_counts().to_dict(): only labels present, most frequent first,
+    ties in order of first appearance (so max() picks the same label idxmax() did).
+    """
+    labels = df['label']
+    if labels.dtype != SENTIMENT_LABEL_DTYPE:
+        labels = _to_sentiment_labels(labels)
+    codes = labels.cat.codes.to_numpy()
+    codes = codes[codes >= 0]
+    counts = np.bincount(codes, minlength=len(SENTIMENT_LABELS))
+    present, first_seen = np.unique(codes, return_index=True)
+    order = sorted(zip(present.tolist(), first_seen.tolist()), key=lambda cf: (-counts[cf[0]], cf[1]))
+    return {SENTIMENT_LABELS[code]: int(counts[code]) for code, _ in order}
+
+
+def _top_counts(df: pd.DataFrame, col: str, n: int) -> dict:
+    """Counts of the ``n`` most common values in a column (empty if the column is missing)"""
+    if col not in df.columns:
+        return {}
+    counter = Counter(df[col].dropna().to_numpy().tolist())
+    return dict(counter.most_common(n))
+
+
+def _rating_masks(df: pd.DataFrame) -> tuple:
+    """
+    Vectorized upgrade/downgrade masks over analyst titles.
+    A title counts as a downgrade only if it did not already match an upgrade keyword.
+    """
+    if 'title' not in df.columns:
+        no_match = np.zeros(len(df), dtype=bool)
+        return no_match, no_match
+    titles = df['title'].astype('string')
+    up_mask = titles.str.contains(UPGRADE_RE, na=False).to_numpy(dtype=bool)
+    down_mask = titles.str.contains(DOWNGRADE_RE, na=False).to_numpy(dtype=bool) & ~up_mask
+    return up_mask, down_mask
+
+
+def _count_ratings(df: pd.DataFrame) -> tuple:
+    """Count (upgrades, downgrades, neutral) analyst titles from the rating keyword masks"""
+    up_mask, down_mask = _rating_masks(df)
+    upgrades = int(up_mask.sum())
+    downgrades = int(down_mask.sum())
+    return upgrades, downgrades, len(df) - upgrades - downgrades
+
+
 # Initialize global memory and data store
 print("\n[INIT] Initializing Persistent Memory & Data Store...")
 persistent_memory = PersistentMemoryStore()
@@ -517,6 +836,39 @@ data_store = SentimentDataStore(memory_store=persistent_memory)
 print("[READY] Data store with persistent memory ready!\n")
 
 
+# Constant datasource attribution shared by every tool result
+_STORAGE_BACKEND = "bigquery" if data_store.use_bigquery else "gcs"
+_BASE_PATH = f"{config.BIGQUERY_PROJECT}.{config.BIGQUERY_DATASET}"
+
+
+def _cached_response(cached: dict) -> dict:
+    """Return a cached tool result marked as a cache hit (without mutating the stored copy)"""
+    result = dict(cached.get("result", {}))
+    result["performance"] = {**result.get("performance", {}), "cache_hit": True, "latency": "ultra_low"}
+    return result
+
+
+def _base_result(kind: str, **query) -> dict:
+    """
+    Build the result skeleton shared by the sentiment tools.
+    Callers fill in ``status``/``result`` and extend ``datasources`` for the branch taken.
+    """
+    return {
+        "status": "pending",
+        "timestamp": _now_iso(),
+        "query": {"type": kind, **query},
+        "result": {},
+        "datasources": {
+            "storage_backend": _STORAGE_BACKEND,
+            "base_path": _BASE_PATH
+        },
+        "performance": {
+            "cache_hit": False,
+            "query_count": data_store._query_count
+        }
+    }
+
+
 # ============================================================================
 # TOOL FUNCTIONS
 # ============================================================================
@@ -537,39 +889,29 @@ def analyze_news_headline(headline: str) -> dict:
         print(f"\n[ANALYZE] Analyzing headline: '{headline[:50]}...'")
         
         # Check memory for similar queries (low latency)
-        cache_key = f"headline_{headline[:100]}"
+        # Fixed-size digest of the full headline: short key, no collisions between
+        # headlines that share their first 100 characters
+        headline_digest = hashlib.blake2b(headline.strip().lower().encode(), digest_size=8).hexdigest()
+        cache_key = f"headline_{headline_digest}"
         cached = persistent_memory.get_cached_query(cache_key)
         if cached:
             print("⚡ Returning cached headline analysis")
-            return cached.get("result", {})
+            return _cached_response(cached)
         
         # Automatically query all news data
         df = data_store.smart_query('news')
         
+        result = _base_result("headline_analysis", headline=headline)
+        
         if df.empty:
-            result = {
-                "status": "no_data",
-                "timestamp": datetime.now().isoformat(),
-                "query": {
-                    "type": "headline_analysis",
-                    "headline": headline
-                },
-                "result": {
-                    "sentiment": "unknown",
-                    "confidence": "none",
-                    "message": "No news data files available"
-                },
-                "datasources": {
-                    "files_searched": [],
-                    "total_records": 0,
-                    "storage_backend": "gcs" if data_store.use_gcs else "local"
-                },
-                "performance": {
-                    "cache_hit": False,
-                    "query_count": data_store._query_count
-                },
-                "recommendation": "Check GCS bucket configuration"
+            result["status"] = "no_data"
+            result["result"] = {
+                "sentiment": "unknown",
+                "confidence": "none",
+                "message": "No news data files available"
             }
+            result["datasources"].update(files_searched=[], total_records=0)
+            result["recommendation"] = "Check GCS bucket configuration"
             return result
         
         print(f"📰 Searching across {len(df)} news articles")
@@ -587,119 +929,87 @@ def analyze_news_headline(headline: str) -> dict:
                 sentiment = matches.iloc[0].get('label', 'unknown')
                 matched_sources = matches['_source_file'].unique().tolist() if '_source_file' in matches.columns else []
                 
-                result = {
-                    "status": "success",
-                    "timestamp": datetime.now().isoformat(),
-                    "query": {
-                        "type": "headline_analysis",
-                        "headline": headline
-                    },
-                    "result": {
-                        "sentiment": str(sentiment).lower(),
-                        "confidence": "high",
-                        "match_type": "exact_match",
-                        "matches_found": len(matches)
-                    },
-                    "datasources": {
-                        "files_matched": matched_sources,
-                        "files_searched": source_files,
-                        "total_records_searched": len(df),
-                        "matching_records": len(matches),
-                        "storage_backend": "gcs" if data_store.use_gcs else "local",
-                        "base_path": str(data_store.base_path)
-                    },
-                    "performance": {
-                        "cache_hit": False,
-                        "query_count": data_store._query_count,
-                        "latency": "low"
-                    }
+                result["status"] = "success"
+                result["result"] = {
+                    "sentiment": str(sentiment).lower(),
+                    "confidence": "high",
+                    "match_type": "exact_match",
+                    "matches_found": len(matches)
                 }
-                
-                # Cache for future queries
-                persistent_memory.cache_query(cache_key, result, ttl_minutes=60)
-                
-                # Store in memory
-                persistent_memory.add_insight(
-                    f"Headline '{headline[:50]}' analyzed with sentiment: {sentiment}",
-                    category="headline_analysis",
-                    metadata={"sentiment": str(sentiment), "sources": matched_sources}
+                result["datasources"].update(
+                    files_matched=matched_sources,
+                    files_searched=source_files,
+                    total_records_searched=len(df),
+                    matching_records=len(matches)
                 )
+                result["performance"]["latency"] = "low"
+                
+                # Cache for future queries and store the insight in one memory write
+                persistent_memory.save_many([
+                    ("cache", cache_key, result, 60),
+                    ("insight",
+                     f"Headline '{headline[:50]}' analyzed with sentiment: {sentiment}",
+                     "headline_analysis",
+                     {"sentiment": str(sentiment), "sources": matched_sources})
+                ])
                 
                 return result
             
-            # Try keyword-based similarity
-            keywords = headline.lower().split()[:5]
-            for keyword in keywords:
-                if len(keyword) > 4:
-                    matches = df[df['headline'].str.contains(keyword, case=False, na=False)]
+            # Try keyword-based similarity: one scan for any keyword, then
+            # attribute matches per keyword on the (much smaller) subset
+            keywords = [k for k in headline.lower().split()[:5] if len(k) > 4]
+            if keywords and 'label' in df.columns:
+                keyword_pattern = '|'.join(map(re.escape, keywords))
+                candidates = df[df['headline'].str.contains(keyword_pattern, case=False, na=False)]
+                
+                for keyword in keywords:
+                    if candidates.empty:
+                        break
+                    matches = candidates[candidates['headline'].str.contains(
+                        re.escape(keyword), case=False, na=False
+                    )]
                     if not matches.empty:
-                        if 'label' in matches.columns:
-                            sentiment_counts = matches['label'].value_counts()
-                            most_common = sentiment_counts.idxmax()
-                            matched_sources = matches['_source_file'].unique().tolist() if '_source_file' in matches.columns else []
-                            
-                            result = {
-                                "status": "success",
-                                "timestamp": datetime.now().isoformat(),
-                                "query": {
-                                    "type": "headline_analysis",
-                                    "headline": headline
-                                },
-                                "result": {
-                                    "sentiment": str(most_common).lower(),
-                                    "confidence": "medium",
-                                    "match_type": "keyword_match",
-                                    "keyword": keyword,
-                                    "related_headlines": len(matches),
-                                    "sentiment_distribution": sentiment_counts.to_dict()
-                                },
-                                "datasources": {
-                                    "files_matched": matched_sources,
-                                    "files_searched": source_files,
-                                    "total_records_searched": len(df),
-                                    "matching_records": len(matches),
-                                    "storage_backend": "gcs" if data_store.use_gcs else "local",
-                                    "base_path": str(data_store.base_path)
-                                },
-                                "performance": {
-                                    "cache_hit": False,
-                                    "query_count": data_store._query_count
-                                }
-                            }
-                            
-                            persistent_memory.cache_query(cache_key, result, ttl_minutes=30)
-                            return result
-        
-        result = {
-            "status": "no_match",
-            "timestamp": datetime.now().isoformat(),
-            "query": {
-                "type": "headline_analysis",
-                "headline": headline
-            },
-            "result": {
-                "sentiment": "unknown",
-                "confidence": "none",
-                "message": "No matching headlines found in historical data"
-            },
-            "datasources": {
-                "files_searched": source_files,
-                "total_records_searched": len(df),
-                "storage_backend": "gcs" if data_store.use_gcs else "local"
-            },
-            "performance": {
-                "cache_hit": False,
-                "query_count": data_store._query_count
-            },
-            "recommendation": "Consider using LLM inference for unseen headlines"
+                        sentiment_counts = _label_counts(matches)
+                        most_common = max(sentiment_counts, key=sentiment_counts.get) if any(sentiment_counts.values()) else 'unknown'
+                        matched_sources = matches['_source_file'].unique().tolist() if '_source_file' in matches.columns else []
+                        
+                        result["status"] = "success"
+                        result["result"] = {
+                            "sentiment": str(most_common).lower(),
+                            "confidence": "medium",
+                            "match_type": "keyword_match",
+                            "keyword": keyword,
+                            "related_headlines": len(matches),
+                            "sentiment_distribution": sentiment_counts
+                        }
+                        result["datasources"].update(
+                            files_matched=matched_sources,
+                            files_searched=source_files,
+                            total_records_searched=len(df),
+                            matching_records=len(matches)
+                        )
+                        
+                        persistent_memory.cache_query(cache_key, result, ttl_minutes=30)
+                        return result
+        
+        result["status"] = "no_match"
+        result["result"] = {
+            "sentiment": "unknown",
+            "confidence": "none",
+            "message": "No matching headlines found in historical data"
         }
+        result["datasources"].update(
+            files_searched=source_files,
+            total_records_searched=len(df)
+        )
+        result["recommendation"] = "Consider using LLM inference for unseen headlines"
         
         return result
         
     except Exception as e:
         return {
             "status": "error",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "query": {
                 "type": "headline_analysis",
                 "headline": headline
@@ -737,37 +1047,26 @@ def analyze_analyst_sentiment(company_ticker: str, days_lookback: int = 5000) ->
         cached = persistent_memory.get_cached_query(cache_key)
         if cached:
             print("⚡ Returning cached analyst analysis")
-            return cached.get("result", {})
+            return _cached_response(cached)
         
         # Automatically query analyst data filtered by ticker
         df = data_store.smart_query('analyst', filters={'ticker': ticker_upper})
         
+        result = _base_result("analyst_sentiment", ticker=ticker_upper, days_lookback=days_lookback)
+        
         if df.empty:
-            result = {
-                "status": "no_data",
-                "timestamp": datetime.now().isoformat(),
-                "query": {
-                    "type": "analyst_sentiment",
-                    "ticker": ticker_upper,
-                    "days_lookback": days_lookback
-                },
-                "result": {
-                    "sentiment": "unknown",
-                    "confidence": "none",
-                    "message": f"No analyst ratings found for {ticker_upper}"
-                },
-                "datasources": {
-                    "files_searched": list(data_store.file_catalog['sentiment_sources']['analyst']),
-                    "files_matched": [],
-                    "total_records": 0,
-                    "storage_backend": "gcs" if data_store.use_gcs else "local"
-                },
-                "performance": {
-                    "cache_hit": False,
-                    "query_count": data_store._query_count
-                },
-                "recommendation": f"Check if {ticker_upper} exists in analyst data or try different ticker"
+            result["status"] = "no_data"
+            result["result"] = {
+                "sentiment": "unknown",
+                "confidence": "none",
+                "message": f"No analyst ratings found for {ticker_upper}"
             }
+            result["datasources"].update(
+                files_searched=list(data_store.file_catalog['sentiment_sources']['analyst']),
+                files_matched=[],
+                total_records=0
+            )
+            result["recommendation"] = f"Check if {ticker_upper} exists in analyst data or try different ticker"
             return result
         
         print(f"✓ Found {len(df)} analyst ratings for {ticker_upper}")
@@ -778,26 +1077,10 @@ def analyze_analyst_sentiment(company_ticker: str, days_lookback: int = 5000) ->
         # Analyze sentiment from titles
         recent = df.head(50)  # Most recent ratings
         
-        upgrade_keywords = ['upgrade', 'raise', 'outperform', 'buy', 'beat', 'higher', 'positive']
-        downgrade_keywords = ['downgrade', 'lower', 'cut', 'sell', 'miss', 'underperform', 'negative']
+        upgrades, downgrades, neutral = _count_ratings(recent)
         
-        upgrades = 0
-        downgrades = 0
-        neutral = 0
-        sample_titles = []
-        
-        for _, row in recent.iterrows():
-            title = str(row.get('title', '')).lower()
-            if any(word in title for word in upgrade_keywords):
-                upgrades += 1
-            elif any(word in title for word in downgrade_keywords):
-                downgrades += 1
-            else:
-                neutral += 1
-            
-            # Collect sample titles
-            if len(sample_titles) < 5:
-                sample_titles.append(row.get('title', 'N/A'))
+        # Collect sample titles
+        sample_titles = _head_list(recent, 'title', 5) if 'title' in recent.columns else ['N/A'] * min(len(recent), 5)
         
         total = upgrades + downgrades + neutral
         
@@ -811,56 +1094,42 @@ def analyze_analyst_sentiment(company_ticker: str, days_lookback: int = 5000) ->
         # Determine confidence
         confidence = "high" if total > 10 else "medium" if total > 5 else "low"
         
-        result = {
-            "status": "success",
-            "timestamp": datetime.now().isoformat(),
-            "query": {
-                "type": "analyst_sentiment",
-                "ticker": ticker_upper,
-                "days_lookback": days_lookback
-            },
-            "result": {
-                "sentiment": sentiment,
-                "confidence": confidence,
-                "analysis": {
-                    "upgrades": upgrades,
-                    "downgrades": downgrades,
-                    "neutral": neutral,
-                    "total_ratings_analyzed": total,
-                    "upgrade_ratio": round(upgrades / total, 3) if total > 0 else 0,
-                    "downgrade_ratio": round(downgrades / total, 3) if total > 0 else 0,
-                    "sentiment_score": round((upgrades - downgrades) / total, 3) if total > 0 else 0
-                },
-                "sample_ratings": sample_titles,
-                "interpretation": f"Analysts are {sentiment} on {ticker_upper} with {upgrades} upgrades vs {downgrades} downgrades"
-            },
-            "datasources": {
-                "files_matched": source_files,
-                "total_records_found": len(df),
-                "records_analyzed": len(recent),
-                "storage_backend": "gcs" if data_store.use_gcs else "local",
-                "base_path": str(data_store.base_path),
-                "file_paths": df['_source_path'].unique().tolist() if '_source_path' in df.columns else []
+        result["status"] = "success"
+        result["result"] = {
+            "sentiment": sentiment,
+            "confidence": confidence,
+            "analysis": {
+                "upgrades": upgrades,
+                "downgrades": downgrades,
+                "neutral": neutral,
+                "total_ratings_analyzed": total,
+                "upgrade_ratio": round(upgrades / total, 3) if total > 0 else 0,
+                "downgrade_ratio": round(downgrades / total, 3) if total > 0 else 0,
+                "sentiment_score": round((upgrades - downgrades) / total, 3) if total > 0 else 0
             },
-            "performance": {
-                "cache_hit": False,
-                "query_count": data_store._query_count,
-                "latency": "low"
-            }
+            "sample_ratings": sample_titles,
+            "interpretation": f"Analysts are {sentiment} on {ticker_upper} with {upgrades} upgrades vs {downgrades} downgrades"
         }
-        
-        # Cache for future queries
-        persistent_memory.cache_query(cache_key, result, ttl_minutes=60)
-        
-        # Store in persistent memory
-        persistent_memory.add_analysis(ticker_upper, result)
+        result["datasources"].update(
+            files_matched=source_files,
+            total_records_found=len(df),
+            records_analyzed=len(recent),
+            file_paths=df['_source_path'].unique().tolist() if '_source_path' in df.columns else []
+        )
+        result["performance"]["latency"] = "low"
+        
+        # Cache for future queries and store in persistent memory in one write
+        persistent_memory.save_many([
+            ("cache", cache_key, result, 60),
+            ("analysis", ticker_upper, result)
+        ])
         
         return result
         
     except Exception as e:
         return {
             "status": "error",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "query": {
                 "type": "analyst_sentiment",
                 "ticker": company_ticker,
@@ -900,35 +1169,32 @@ def get_comprehensive_sentiment(company_ticker: str, include_transcripts: bool =
         cached = persistent_memory.get_cached_query(cache_key)
         if cached:
             print("⚡ Returning cached comprehensive analysis")
-            return cached.get("result", {})
-        
-        result = {
-            "status": "pending",
-            "timestamp": datetime.now().isoformat(),
-            "query": {
-                "type": "comprehensive_sentiment",
-                "ticker": ticker_upper,
-                "include_transcripts": include_transcripts
-            },
-            "result": {
-                "overall_sentiment": "unknown",
-                "confidence": "none",
-                "sentiment_by_source": {},
-                "aggregated_metrics": {}
-            },
-            "datasources": {
-                "sources_queried": [],
-                "sources_with_data": [],
-                "files_by_source": {},
-                "total_records_by_source": {},
-                "storage_backend": "gcs" if data_store.use_gcs else "local",
-                "base_path": str(data_store.base_path)
-            },
-            "performance": {
-                "cache_hit": False,
-                "query_count": data_store._query_count
-            }
+            return _cached_response(cached)
+        
+        result = _base_result("comprehensive_sentiment", ticker=ticker_upper, include_transcripts=include_transcripts)
+        result["result"] = {
+            "overall_sentiment": "unknown",
+            "confidence": "none",
+            "sentiment_by_source": {},
+            "aggregated_metrics": {}
         }
+        result["datasources"].update(
+            sources_queried=[],
+            sources_with_data=[],
+            files_by_source={},
+            total_records_by_source={}
+        )
+        
+        # Tickers absent from every source can't have data: skip the per-source queries
+        if not data_store.has_ticker(ticker_upper, include_transcripts):
+            result["status"] = "no_data"
+            result["result"]["message"] = f"No data found for {ticker_upper} across any source"
+            print(f"\n⚠️  {ticker_upper} not present in any sentiment source")
+            persistent_memory.save_many([
+                ("cache", cache_key, result, 30),
+                ("analysis", ticker_upper, result)
+            ])
+            return result
         
         sources_with_data = []
         total_records = 0
@@ -943,7 +1209,7 @@ def get_comprehensive_sentiment(company_ticker: str, include_transcripts: bool =
             news_files = news_df['_source_file'].unique().tolist() if '_source_file' in news_df.columns else []
             
             if 'label' in news_df.columns:
-                news_sentiment = news_df['label'].value_counts().to_dict()
+                news_sentiment = _label_counts(news_df)
                 total_positive = news_sentiment.get('positive', 0)
                 total_negative = news_sentiment.get('negative', 0)
                 total_neutral = news_sentiment.get('neutral', 0)
@@ -955,7 +1221,7 @@ def get_comprehensive_sentiment(company_ticker: str, include_transcripts: bool =
                     "positive_ratio": round(total_positive / total_news, 3) if total_news > 0 else 0,
                     "negative_ratio": round(total_negative / total_news, 3) if total_news > 0 else 0,
                     "sentiment_score": round((total_positive - total_negative) / total_news, 3) if total_news > 0 else 0,
-                    "sample_headlines": news_df.head(3)['headline'].tolist() if 'headline' in news_df.columns else []
+                    "sample_headlines": _head_list(news_df, 'headline', 3)
                 }
                 
                 result["datasources"]["files_by_source"]["news"] = news_files
@@ -974,21 +1240,7 @@ def get_comprehensive_sentiment(company_ticker: str, include_transcripts: bool =
             analyst_files = analyst_df['_source_file'].unique().tolist() if '_source_file' in analyst_df.columns else []
             
             # Analyze analyst sentiment
-            upgrade_keywords = ['upgrade', 'raise', 'outperform', 'buy', 'beat', 'higher', 'positive']
-            downgrade_keywords = ['downgrade', 'lower', 'cut', 'sell', 'miss', 'underperform', 'negative']
-            
-            upgrades = 0
-            downgrades = 0
-            neutral = 0
-            
-            for _, row in analyst_df.iterrows():
-                title = str(row.get('title', '')).lower()
-                if any(word in title for word in upgrade_keywords):
-                    upgrades += 1
-                elif any(word in title for word in downgrade_keywords):
-                    downgrades += 1
-                else:
-                    neutral += 1
+            upgrades, downgrades, neutral = _count_ratings(analyst_df)
             
             total_analyst = len(analyst_df)
             
@@ -999,7 +1251,7 @@ def get_comprehensive_sentiment(company_ticker: str, include_transcripts: bool =
                 "total_ratings": total_analyst,
                 "upgrade_ratio": round(upgrades / total_analyst, 3) if total_analyst > 0 else 0,
                 "sentiment_score": round((upgrades - downgrades) / total_analyst, 3) if total_analyst > 0 else 0,
-                "sample_titles": analyst_df.head(3)['title'].tolist() if 'title' in analyst_df.columns else []
+                "sample_titles": _head_list(analyst_df, 'title', 3)
             }
             
             result["datasources"]["files_by_source"]["analyst"] = analyst_files
@@ -1012,7 +1264,7 @@ def get_comprehensive_sentiment(company_ticker: str, include_transcripts: bool =
         if include_transcripts:
             print("  [TRANSCRIPTS] Checking for earnings transcripts...")
             result["datasources"]["sources_queried"].append("transcripts")
-            transcript_files = data_store.get_files_for_intent('transcripts')
+            transcript_files = data_store.get_tables_for_intent('transcripts')
             matching_transcripts = [f for f in transcript_files if ticker_upper in str(f).upper()]
             
             if matching_transcripts:
@@ -1075,18 +1327,18 @@ def get_comprehensive_sentiment(company_ticker: str, include_transcripts: bool =
             result["result"]["message"] = f"No data found for {ticker_upper} across any source"
             print(f"\n⚠️  No data found for {ticker_upper}")
         
-        # Cache comprehensive result
-        persistent_memory.cache_query(cache_key, result, ttl_minutes=30)
-        
-        # Store in persistent memory
-        persistent_memory.add_analysis(ticker_upper, result)
+        # Cache comprehensive result and store in persistent memory in one write
+        persistent_memory.save_many([
+            ("cache", cache_key, result, 30),
+            ("analysis", ticker_upper, result)
+        ])
         
         return result
         
     except Exception as e:
         return {
             "status": "error",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "query": {
                 "type": "comprehensive_sentiment",
                 "ticker": company_ticker
@@ -1122,30 +1374,17 @@ def get_sentiment_statistics(source: str = "all") -> dict:
         cached = persistent_memory.get_cached_query(cache_key)
         if cached:
             print("⚡ Returning cached statistics")
-            return cached.get("result", {})
+            return _cached_response(cached)
         
-        result = {
-            "status": "pending",
-            "timestamp": datetime.now().isoformat(),
-            "query": {
-                "type": "sentiment_statistics",
-                "source": source
-            },
-            "result": {
-                "sources": {},
-                "overall_metrics": {}
-            },
-            "datasources": {
-                "sources_analyzed": [],
-                "files_by_source": {},
-                "storage_backend": "gcs" if data_store.use_gcs else "local",
-                "base_path": str(data_store.base_path)
-            },
-            "performance": {
-                "cache_hit": False,
-                "query_count": data_store._query_count
-            }
+        result = _base_result("sentiment_statistics", source=source)
+        result["result"] = {
+            "sources": {},
+            "overall_metrics": {}
         }
+        result["datasources"].update(
+            sources_analyzed=[],
+            files_by_source={}
+        )
         
         total_records = 0
         
@@ -1157,8 +1396,12 @@ def get_sentiment_statistics(source: str = "all") -> dict:
                 news_files = df['_source_file'].unique().tolist() if '_source_file' in df.columns else []
                 
                 if 'label' in df.columns:
-                    sentiment_counts = df['label'].value_counts().to_dict()
-                    sentiment_pcts = (df['label'].value_counts(normalize=True) * 100).round(2).to_dict()
+                    sentiment_counts = _label_counts(df)
+                    labelled = sum(sentiment_counts.values())
+                    sentiment_pcts = {
+                        label: round(count / labelled * 100, 2) if labelled > 0 else 0.0
+                        for label, count in sentiment_counts.items()
+                    }
                     
                     # Calculate additional metrics
                     positive = sentiment_counts.get('positive', 0)
@@ -1172,7 +1415,7 @@ def get_sentiment_statistics(source: str = "all") -> dict:
                         "sentiment_percentages": sentiment_pcts,
                         "sentiment_score": round((positive - negative) / total, 3) if total > 0 else 0,
                         "unique_stocks": df['stock'].nunique() if 'stock' in df.columns else 0,
-                        "top_mentioned_stocks": df['stock'].value_counts().head(10).to_dict() if 'stock' in df.columns else {}
+                        "top_mentioned_stocks": _top_counts(df, 'stock', 10)
                     }
                     
                     result["datasources"]["files_by_source"]["news"] = news_files
@@ -1192,11 +1435,11 @@ def get_sentiment_statistics(source: str = "all") -> dict:
                 analyst_stats = {
                     "total_ratings": total_analyst,
                     "unique_stocks": df['stock'].nunique() if 'stock' in df.columns else 0,
-                    "top_analyzed_stocks": df['stock'].value_counts().head(10).to_dict() if 'stock' in df.columns else {}
+                    "top_analyzed_stocks": _top_counts(df, 'stock', 10)
                 }
                 
                 if 'date' in df.columns:
-                    df['date'] = pd.to_datetime(df['date'], errors='coerce')
+                    df['date'] = pd.to_datetime(df['date'], format='ISO8601', errors='coerce', cache=True)
                     analyst_stats["date_range"] = {
                         "earliest": str(df['date'].min()),
                         "latest": str(df['date'].max()),
@@ -1204,18 +1447,9 @@ def get_sentiment_statistics(source: str = "all") -> dict:
                     }
                 
                 # Analyze upgrade/downgrade sentiment
-                upgrade_keywords = ['upgrade', 'raise', 'outperform', 'buy', 'beat', 'higher', 'positive']
-                downgrade_keywords = ['downgrade', 'lower', 'cut', 'sell', 'miss', 'underperform', 'negative']
-                
-                upgrades = 0
-                downgrades = 0
-                
-                for _, row in df.iterrows():
-                    title = str(row.get('title', '')).lower()
-                    if any(word in title for word in upgrade_keywords):
-                        upgrades += 1
-                    elif any(word in title for word in downgrade_keywords):
-                        downgrades += 1
+                up_mask, down_mask = _rating_masks(df)
+                upgrades = int(up_mask.sum())
+                downgrades = int(down_mask.sum())
                 
                 analyst_stats["sentiment_analysis"] = {
                     "upgrades": upgrades,
@@ -1265,7 +1499,7 @@ def get_sentiment_statistics(source: str = "all") -> dict:
     except Exception as e:
         return {
             "status": "error",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "query": {
                 "type": "sentiment_statistics",
                 "source": source
@@ -1298,7 +1532,7 @@ def recall_ticker_history(ticker: str) -> dict:
         
         result = {
             "status": "success" if history else "no_data",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "query": {
                 "type": "recall_memory",
                 "ticker": ticker_upper
@@ -1331,7 +1565,7 @@ def recall_ticker_history(ticker: str) -> dict:
     except Exception as e:
         return {
             "status": "error",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "query": {
                 "type": "recall_memory",
                 "ticker": ticker
@@ -1360,7 +1594,7 @@ def search_agent_memory(query: str) -> dict:
         
         result = {
             "status": "success",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "query": {
                 "type": "memory_search",
                 "search_term": query
@@ -1389,7 +1623,7 @@ def search_agent_memory(query: str) -> dict:
     except Exception as e:
         return {
             "status": "error",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "query": {
                 "type": "memory_search",
                 "search_term": query
@@ -1411,29 +1645,32 @@ def get_memory_statistics() -> dict:
     try:
         print(f"\n[MEMORY] Retrieving memory statistics")
         
-        memory_stats = persistent_memory.memory.get("statistics", {})
+        persistent_memory._evict_expired()
+        memory = persistent_memory.memory
+        memory_stats = memory.get("statistics", {})
+        analyzed_tickers = memory.get("analyzed_tickers", {})
         
         result = {
             "status": "success",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "query": {
                 "type": "memory_statistics"
             },
             "result": {
                 "memory_info": {
-                    "version": persistent_memory.memory.get("version"),
-                    "created_at": persistent_memory.memory.get("created_at"),
-                    "last_updated": persistent_memory.memory.get("last_updated"),
-                    "session_count": persistent_memory.memory.get("session_count", 0)
+                    "version": memory.get("version"),
+                    "created_at": memory.get("created_at"),
+                    "last_updated": memory.get("last_updated"),
+                    "session_count": memory.get("session_count", 0)
                 },
                 "statistics": memory_stats,
                 "stored_data": {
-                    "unique_tickers_analyzed": len(persistent_memory.memory.get("analyzed_tickers", {})),
-                    "total_insights": len(persistent_memory.memory.get("insights", [])),
-                    "cached_queries": len(persistent_memory.memory.get("query_cache", {})),
-                    "sentiment_history_entries": len(persistent_memory.memory.get("sentiment_history", []))
+                    "unique_tickers_analyzed": len(analyzed_tickers),
+                    "total_insights": len(memory.get("insights", [])),
+                    "cached_queries": len(memory.get("query_cache", {})),
+                    "sentiment_history_entries": len(memory.get("sentiment_history", []))
                 },
-                "top_analyzed_tickers": list(persistent_memory.memory.get("analyzed_tickers", {}).keys())[:10]
+                "top_analyzed_tickers": list(islice(analyzed_tickers, 10))
             },
             "datasources": {
                 "source": "agent_persistent_memory",
@@ -1445,7 +1682,8 @@ def get_memory_statistics() -> dict:
                     memory_stats.get("cache_hits", 0) / memory_stats.get("total_queries", 1), 3
                 ) if memory_stats.get("total_queries", 0) > 0 else 0,
                 "total_queries": memory_stats.get("total_queries", 0),
-                "cache_hits": memory_stats.get("cache_hits", 0)
+                "cache_hits": memory_stats.get("cache_hits", 0),
+                "cache_entries_pruned": memory_stats.get("cache_entries_pruned", 0)
             }
         }
         
@@ -1456,7 +1694,7 @@ def get_memory_statistics() -> dict:
     except Exception as e:
         return {
             "status": "error",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "query": {
                 "type": "memory_statistics"
             },
@@ -10,7 +10,6 @@ from pathlib import Path
 # Add parent directory to path to import app modules
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-import gcsfs
 from app.config import config
 
 
@@ -41,8 +40,9 @@ def list_bucket_contents():
     print(f"\n📦 Bucket: {config.GCS_DATA_BUCKET}")
     print(f"📂 Dataset Prefix: {config.GCS_DATASET_PREFIX}")
     
-    # Initialize GCS filesystem
+    # Initialize GCS filesystem (gcsfs imported here so a missing bucket config exits without loading it)
     try:
+        import gcsfs
         fs = gcsfs.GCSFileSystem()
         print("✅ Connected to GCS")
     except Exception as e:
@@ -4,12 +4,13 @@ Test script to verify BigQuery integration and caching
 """
 import sys
 import os
-from datetime import datetime
+import statistics
+import time
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from app.sub_agents.event_impact_agent.tools import _data_loader, list_available_symbols, load_price_data
+from app.sub_agents.event_impact_agent.tools import _data_loader, list_available_symbols, load_price_data, load_price_data_many
 from app.config import config
 
 def test_bigquery_connection():
@@ -42,9 +43,9 @@ def test_bigquery_connection():
         # Test 3: Load price data for a specific symbol (with cache)
         print("\n\nTest 3: Loading price data for AAPL (first call - no cache)...")
         print("-" * 80)
-        start_time = datetime.now()
+        start_time = time.perf_counter_ns()
         result = load_price_data("AAPL")
-        duration = (datetime.now() - start_time).total_seconds()
+        duration = (time.perf_counter_ns() - start_time) / 1e9
         
         if result["status"] == "success":
             print(f"[OK] Successfully loaded {result['rows']} rows for AAPL")
@@ -57,9 +58,9 @@ def test_bigquery_connection():
         # Test 4: Load same data again (should use cache)
         print("\n\nTest 4: Loading price data for AAPL again (should use cache)...")
         print("-" * 80)
-        start_time = datetime.now()
+        start_time = time.perf_counter_ns()
         result = load_price_data("AAPL")
-        duration = (datetime.now() - start_time).total_seconds()
+        duration = (time.perf_counter_ns() - start_time) / 1e9
         
         if result["status"] == "success":
             print(f"[OK] Successfully loaded {result['rows']} rows for AAPL")
@@ -115,24 +116,41 @@ def test_cache_performance():
         
         # First load (cold)
         print("\n1. Cold load (no cache)...")
-        start = datetime.now()
+        start = time.perf_counter_ns()
         load_price_data("MSFT")
-        cold_duration = (datetime.now() - start).total_seconds()
+        cold_duration = (time.perf_counter_ns() - start) / 1e9
         print(f"   Duration: {cold_duration:.2f}s")
         
-        # Second load (cached)
-        print("\n2. Warm load (cached)...")
-        start = datetime.now()
-        load_price_data("MSFT")
-        warm_duration = (datetime.now() - start).total_seconds()
-        print(f"   Duration: {warm_duration:.2f}s")
+        # Warm loads (cached); median of 5 to keep timer noise out of the speedup
+        print("\n2. Warm load (cached, median of 5)...")
+        warm_samples = []
+        for _ in range(5):
+            start = time.perf_counter_ns()
+            load_price_data("MSFT")
+            warm_samples.append((time.perf_counter_ns() - start) / 1e9)
+        warm_duration = statistics.median(warm_samples)
+        print(f"   Duration: {warm_duration:.4f}s")
         
         # Calculate speedup
         if warm_duration > 0:
             speedup = cold_duration / warm_duration
             print(f"\n[SPEEDUP] Cache speedup: {speedup:.1f}x faster")
             print(f"   Cold: {cold_duration:.2f}s")
-            print(f"   Warm: {warm_duration:.2f}s")
+            print(f"   Warm: {warm_duration:.4f}s")
+        
+        # Batch load (one table read for several instruments)
+        instruments = ["Dow Jones", "Gold", "Treasury Yield 10 Years"]
+        _data_loader.clear_cache("30_yr_stock_market_data")
+        print(f"\n3. Batch load of {len(instruments)} instruments (cold)...")
+        start = time.perf_counter_ns()
+        batch = load_price_data_many(instruments)
+        batch_duration = (time.perf_counter_ns() - start) / 1e9
+        print(f"   Duration: {batch_duration:.2f}s")
+        if batch["status"] == "success":
+            loaded = sum(1 for r in batch["results"].values() if r["status"] == "success")
+            print(f"   Loaded: {loaded}/{len(instruments)} instruments")
+        else:
+            print(f"   [FAIL] Failed: {batch.get('message')}")
         
         return True
         
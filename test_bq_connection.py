@@ -18,20 +18,22 @@ try:
     client = bigquery.Client(project=project_id)
     print("[OK] BigQuery client created successfully")
     
-    # List tables in the dataset
+    # List tables in the dataset with row counts and sizes in one query
+    # (__TABLES__ metadata instead of one get_table() round-trip per table)
     print(f"\nListing tables in {dataset_id}...")
-    dataset_ref = f"{project_id}.{dataset_id}"
-    tables = list(client.list_tables(dataset_ref))
+    tables_query = f"""
+    SELECT table_id, row_count, size_bytes
+    FROM `{project_id}.{dataset_id}.__TABLES__`
+    ORDER BY table_id
+    """
+    tables = list(client.query(tables_query).result())
     
     if tables:
         print(f"\n[SUCCESS] Found {len(tables)} tables:")
         for table in tables:
             print(f"  - {table.table_id}")
-            # Get table info
-            table_ref = f"{project_id}.{dataset_id}.{table.table_id}"
-            table_obj = client.get_table(table_ref)
-            print(f"    Rows: {table_obj.num_rows:,}")
-            print(f"    Size: {table_obj.num_bytes / 1024 / 1024:.2f} MB")
+            print(f"    Rows: {table.row_count:,}")
+            print(f"    Size: {table.size_bytes / 1024 / 1024:.2f} MB")
     else:
         print("\n[WARNING] No tables found in the dataset")
         print("You need to load your data into BigQuery tables.")
@@ -6,6 +6,7 @@ Tests encoding handling on both Windows and Linux
 import sys
 import platform
 import os
+import re
 
 # Platform detection
 PLATFORM = platform.system()
@@ -100,10 +101,16 @@ def test_file_operations():
     except Exception as e:
         print(f"   ❌ Read failed: {e}")
     
-    # Test 3: Binary mode read
+    # Read the raw bytes once; tests 3 and 4 decode the same buffer
     try:
         with open(test_file, 'rb') as f:
             binary_data = f.read()
+    except Exception as e:
+        binary_data = None
+        print(f"   ❌ Binary read failed: {e}")
+    
+    # Test 3: Binary mode read
+    try:
         decoded = binary_data.decode('utf-8')
         # On Windows, line endings might be normalized
         if decoded == test_data or decoded.replace('\r\n', '\n') == test_data:
@@ -116,8 +123,6 @@ def test_file_operations():
     
     # Test 4: Error replacement
     try:
-        with open(test_file, 'rb') as f:
-            binary_data = f.read()
         # Try to decode with latin-1 (will work but may be wrong)
         decoded = binary_data.decode('latin-1')
         # Then try with error replacement
@@ -145,18 +150,22 @@ def test_code_implementation():
         with open("app/sub_agents/event_impact_agent/tools.py", "r", encoding="utf-8") as f:
             content = f.read()
         
-        checks = {
-            "Platform detection": "platform.system()" in content,
-            "IS_WINDOWS flag": "IS_WINDOWS" in content,
-            "IS_LINUX flag": "IS_LINUX" in content,
-            "Binary mode": "'rb'" in content,
-            "UTF-8 encoding": "encoding='utf-8'" in content,
-            "Latin-1 fallback": "'latin-1'" in content,
-            "CP1252 fallback": "'cp1252'" in content,
-            "Error replacement": "encoding_errors='replace'" in content,
-            "Line terminator": "lineterminator=" in content,
-            "Cross-platform docs": "Cross-platform compatible" in content,
+        # Label -> token; one regex pass over the file finds every token present
+        tokens = {
+            "Platform detection": "platform.system()",
+            "IS_WINDOWS flag": "IS_WINDOWS",
+            "IS_LINUX flag": "IS_LINUX",
+            "Binary mode": "'rb'",
+            "UTF-8 encoding": "encoding='utf-8'",
+            "Latin-1 fallback": "'latin-1'",
+            "CP1252 fallback": "'cp1252'",
+            "Error replacement": "encoding_errors='replace'",
+            "Line terminator": "lineterminator=",
+            "Cross-platform docs": "Cross-platform compatible",
         }
+        pattern = re.compile("|".join(re.escape(token) for token in tokens.values()))
+        found = set(pattern.findall(content))
+        checks = {check: token in found for check, token in tokens.items()}
         
         passed = 0
         for check, result in checks.items():
@@ -4,6 +4,7 @@ Test script to verify the encoding fix for CSV files
 """
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # Set UTF-8 encoding for console output on Windows
 if os.name == 'nt':
@@ -28,22 +29,29 @@ def test_encoding_fix():
     
     results = {}
     
+    # Each load is network-bound, so run them concurrently and report in order
+    with ThreadPoolExecutor(max_workers=len(files_to_test)) as executor:
+        futures = {
+            filename: executor.submit(_data_loader.load_csv_from_gcs, filename, use_cache=False, as_arrow=True)
+            for filename in files_to_test
+        }
+    
     for filename in files_to_test:
         print(f"\n📄 Testing {filename}...")
         print("-" * 80)
         
         try:
-            df = _data_loader.load_csv_from_gcs(filename, use_cache=False)
+            table = futures[filename].result()
             
             print(f"✅ Successfully loaded {filename}")
-            print(f"   Rows: {len(df):,}")
-            print(f"   Columns: {len(df.columns)}")
-            print(f"   Column names: {list(df.columns)[:5]}{'...' if len(df.columns) > 5 else ''}")
+            print(f"   Rows: {table.num_rows:,}")
+            print(f"   Columns: {table.num_columns}")
+            print(f"   Column names: {table.column_names[:5]}{'...' if table.num_columns > 5 else ''}")
             
             results[filename] = {
                 "status": "success",
-                "rows": len(df),
-                "columns": len(df.columns)
+                "rows": table.num_rows,
+                "columns": table.num_columns
             }
             
         except Exception as e:
@@ -1,25 +1,41 @@
 #!/usr/bin/env python3
 """
 Test script to verify persistent memory saves correctly.
-Tests the new hybrid save approach (every 5 operations + shutdown).
+Tests the hybrid save approach (every SAVE_EVERY_OPS operations + shutdown).
 """
 
 import sys
-import time
 from pathlib import Path
 
+import pytest
+
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from app.sub_agents.news_sentiment_agent.tools import PersistentMemoryStore
 
-def test_periodic_saves():
-    """Test that memory saves every 5 operations"""
-    print("=" * 70)
-    print("TEST 1: Periodic Saves (Every 5 Operations)")
-    print("=" * 70)
+SEP = "=" * 70
+SAVE_EVERY = PersistentMemoryStore.SAVE_EVERY_OPS
+
+@pytest.fixture(scope="module")
+def memory():
+    """One store shared by all tests: construction loads the session snapshot from GCS"""
+    store = PersistentMemoryStore()
+    yield store
+    store.cleanup()
+
+def _start_fresh(memory):
+    """Zero the periodic-save counters so each test counts only its own operations"""
+    memory._operations_since_save = 0
+    memory._dirty = False
+
+def test_periodic_saves(memory):
+    """Test that memory saves every SAVE_EVERY operations"""
+    print(SEP)
+    print(f"TEST 1: Periodic Saves (Every {SAVE_EVERY} Operations)")
+    print(SEP)
     
-    memory = PersistentMemoryStore()
+    _start_fresh(memory)
     
     test_tickers = ["AAPL", "MSFT", "GOOGL", "TSLA", "AMZN", "META", "NVDA"]
     
@@ -41,57 +57,55 @@ def test_periodic_saves():
         print(f"   Operations count: {memory._operations_since_save}")
         print(f"   Dirty flag: {memory._dirty}")
         
-        if i % 5 == 0:
+        if i % SAVE_EVERY == 0:
             print(f"   ✅ EXPECTED: Memory should have been saved!")
             assert memory._operations_since_save == 0, "Counter should reset after save"
             assert not memory._dirty, "Dirty flag should be cleared after save"
-        
-        time.sleep(0.5)  # Small delay for readability
     
-    print("\n" + "=" * 70)
+    print("\n" + SEP)
     print("✅ TEST 1 PASSED: Periodic saves working correctly!")
-    print("=" * 70)
+    print(SEP)
 
-def test_cache_operations():
+def test_cache_operations(memory):
     """Test that query caching also triggers saves"""
-    print("\n" + "=" * 70)
+    print("\n" + SEP)
     print("TEST 2: Query Cache Operations")
-    print("=" * 70)
+    print(SEP)
     
-    memory = PersistentMemoryStore()
+    _start_fresh(memory)
     
     print(f"\n📊 Initial state:")
     print(f"   Operations count: {memory._operations_since_save}")
     
-    for i in range(1, 6):
+    # Keys and payloads built up front so the loop only exercises cache_query
+    queries = [
+        (f"query_{i}", {"sentiment": "positive", "ticker": f"TEST{i}", "score": 0.8})
+        for i in range(1, 6)
+    ]
+    
+    for i, (query_key, result) in enumerate(queries, 1):
         print(f"\n{i}. Caching query result...")
         
-        result = {
-            "sentiment": "positive",
-            "ticker": f"TEST{i}",
-            "score": 0.8
-        }
-        
-        memory.cache_query(f"query_{i}", result, ttl_minutes=60)
+        memory.cache_query(query_key, result, ttl_minutes=60)
         
         print(f"   Operations count: {memory._operations_since_save}")
         print(f"   Dirty flag: {memory._dirty}")
         
-        if i == 5:
+        if i % SAVE_EVERY == 0:
             print(f"   ✅ EXPECTED: Memory should have been saved!")
             assert memory._operations_since_save == 0, "Counter should reset"
     
-    print("\n" + "=" * 70)
+    print("\n" + SEP)
     print("✅ TEST 2 PASSED: Cache operations trigger saves correctly!")
-    print("=" * 70)
+    print(SEP)
 
-def test_mixed_operations():
+def test_mixed_operations(memory):
     """Test mixed operations (analysis + cache + insights)"""
-    print("\n" + "=" * 70)
+    print("\n" + SEP)
     print("TEST 3: Mixed Operations")
-    print("=" * 70)
+    print(SEP)
     
-    memory = PersistentMemoryStore()
+    _start_fresh(memory)
     
     operations = [
         ("analysis", "AAPL"),
@@ -116,32 +130,32 @@ def test_mixed_operations():
         print(f"   Operations count: {memory._operations_since_save}")
         print(f"   Dirty flag: {memory._dirty}")
         
-        if i == 5:
+        if i % SAVE_EVERY == 0:
             print(f"   ✅ EXPECTED: Memory should have been saved!")
             assert memory._operations_since_save == 0, "Counter should reset"
     
-    print("\n" + "=" * 70)
+    print("\n" + SEP)
     print("✅ TEST 3 PASSED: Mixed operations work correctly!")
-    print("=" * 70)
+    print(SEP)
 
-def test_shutdown_save():
+def test_shutdown_save(memory):
     """Test that memory saves on shutdown"""
-    print("\n" + "=" * 70)
+    print("\n" + SEP)
     print("TEST 4: Shutdown Save (atexit)")
-    print("=" * 70)
+    print(SEP)
     
-    memory = PersistentMemoryStore()
+    _start_fresh(memory)
     
-    # Add 3 operations (less than 5, so no auto-save)
-    print("\n📊 Adding 3 operations (won't trigger auto-save)...")
-    memory.add_analysis("AAPL", {"sentiment": "positive"})
-    memory.add_analysis("MSFT", {"sentiment": "positive"})
-    memory.add_analysis("GOOGL", {"sentiment": "positive"})
+    # One operation short of the periodic save
+    pending = SAVE_EVERY - 1
+    print(f"\n📊 Adding {pending} operations (won't trigger auto-save)...")
+    for ticker in ["AAPL", "MSFT", "GOOGL", "TSLA", "AMZN"][:pending]:
+        memory.add_analysis(ticker, {"sentiment": "positive"})
     
-    print(f"   Operations count: {memory._operations_since_save} (should be 3)")
+    print(f"   Operations count: {memory._operations_since_save} (should be {pending})")
     print(f"   Dirty flag: {memory._dirty} (should be True)")
     
-    assert memory._operations_since_save == 3, "Should have 3 operations"
+    assert memory._operations_since_save == pending, f"Should have {pending} operations"
     assert memory._dirty, "Should be dirty"
     
     # Simulate shutdown
@@ -154,34 +168,36 @@ def test_shutdown_save():
     assert memory._operations_since_save == 0, "Should be reset after cleanup"
     assert not memory._dirty, "Should not be dirty after cleanup"
     
-    print("\n" + "=" * 70)
+    print("\n" + SEP)
     print("✅ TEST 4 PASSED: Shutdown save works correctly!")
-    print("=" * 70)
+    print(SEP)
 
 def main():
     """Run all tests"""
-    print("\n" + "=" * 70)
+    print("\n" + SEP)
     print("🧪 TESTING PERSISTENT MEMORY SAVE FIX")
-    print("=" * 70)
+    print(SEP)
     print("\nThis test verifies the hybrid save approach:")
-    print("  1. Saves every 5 operations (any type)")
+    print(f"  1. Saves every {SAVE_EVERY} operations (any type)")
     print("  2. Saves on shutdown (cleanup)")
     print("  3. Resets counter after save")
     print()
     
+    memory = PersistentMemoryStore()
+    
     try:
         # Run tests
-        test_periodic_saves()
-        test_cache_operations()
-        test_mixed_operations()
-        test_shutdown_save()
+        test_periodic_saves(memory)
+        test_cache_operations(memory)
+        test_mixed_operations(memory)
+        test_shutdown_save(memory)
         
         # Final summary
-        print("\n" + "=" * 70)
+        print("\n" + SEP)
         print("🎉 ALL TESTS PASSED!")
-        print("=" * 70)
+        print(SEP)
         print("\n✅ Memory persistence is working correctly:")
-        print("   • Saves every 5 operations ✓")
+        print(f"   • Saves every {SAVE_EVERY} operations ✓")
         print("   • Saves on shutdown ✓")
         print("   • Counter resets after save ✓")
         print("   • Works for all operation types ✓")
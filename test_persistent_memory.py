@@ -5,6 +5,12 @@ Demonstrates low-latency caching and datasource attribution.
 """
 
 import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from app.sub_agents.news_sentiment_agent.tools import (
     analyze_news_headline,
     analyze_analyst_sentiment,
@@ -16,21 +22,26 @@ from app.sub_agents.news_sentiment_agent.tools import (
     persistent_memory
 )
 
+SEP = "=" * 80
+
 
 def print_json(data, title=""):
     """Pretty print JSON data"""
     if title:
-        print(f"\n{'='*80}")
+        print("\n" + SEP)
         print(f"  {title}")
-        print(f"{'='*80}")
-    print(json.dumps(data, indent=2))
+        print(SEP)
+    if orjson:
+        print(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY, default=str).decode())
+    else:
+        print(json.dumps(data, indent=2))
 
 
 def test_headline_analysis():
     """Test headline sentiment analysis with caching"""
-    print("\n" + "="*80)
+    print("\n" + SEP)
     print("TEST 1: HEADLINE ANALYSIS WITH STRUCTURED JSON OUTPUT")
-    print("="*80)
+    print(SEP)
     
     headline = "Apple announces record quarterly earnings"
     
@@ -51,9 +62,9 @@ def test_headline_analysis():
 
 def test_analyst_sentiment():
     """Test analyst sentiment with datasource attribution"""
-    print("\n" + "="*80)
+    print("\n" + SEP)
     print("TEST 2: ANALYST SENTIMENT WITH FULL DATASOURCE ATTRIBUTION")
-    print("="*80)
+    print(SEP)
     
     ticker = "AAPL"
     
@@ -71,9 +82,9 @@ def test_analyst_sentiment():
 
 def test_comprehensive_sentiment():
     """Test multi-source comprehensive sentiment"""
-    print("\n" + "="*80)
+    print("\n" + SEP)
     print("TEST 3: COMPREHENSIVE MULTI-SOURCE SENTIMENT ANALYSIS")
-    print("="*80)
+    print(SEP)
     
     ticker = "MSFT"
     
@@ -94,9 +105,9 @@ def test_comprehensive_sentiment():
 
 def test_memory_recall():
     """Test persistent memory recall"""
-    print("\n" + "="*80)
+    print("\n" + SEP)
     print("TEST 4: PERSISTENT MEMORY RECALL")
-    print("="*80)
+    print(SEP)
     
     # First, analyze a ticker to store in memory
     ticker = "GOOGL"
@@ -116,9 +127,9 @@ def test_memory_recall():
 
 def test_memory_statistics():
     """Test memory statistics"""
-    print("\n" + "="*80)
+    print("\n" + SEP)
     print("TEST 5: AGENT MEMORY STATISTICS")
-    print("="*80)
+    print(SEP)
     
     print("\n📊 Getting memory statistics:")
     stats = get_memory_statistics()
@@ -136,9 +147,9 @@ def test_memory_statistics():
 
 def test_statistics():
     """Test sentiment statistics"""
-    print("\n" + "="*80)
+    print("\n" + SEP)
     print("TEST 6: MARKET-WIDE SENTIMENT STATISTICS")
-    print("="*80)
+    print(SEP)
     
     print("\n📈 Getting market-wide statistics:")
     stats = get_sentiment_statistics("all")
@@ -147,9 +158,9 @@ def test_statistics():
 
 def test_memory_search():
     """Test memory search"""
-    print("\n" + "="*80)
+    print("\n" + SEP)
     print("TEST 7: MEMORY SEARCH")
-    print("="*80)
+    print(SEP)
     
     query = "AAPL"
     print(f"\n🔍 Searching memory for: {query}")
@@ -159,9 +170,9 @@ def test_memory_search():
 
 def save_persistent_memory():
     """Force save persistent memory to GCS"""
-    print("\n" + "="*80)
+    print("\n" + SEP)
     print("SAVING PERSISTENT MEMORY TO GCS")
-    print("="*80)
+    print(SEP)
     
     print("\n💾 Forcing memory save to GCS...")
     persistent_memory.save_memory(force=True)
@@ -170,9 +181,9 @@ def save_persistent_memory():
 
 def main():
     """Run all tests"""
-    print("\n" + "="*80)
+    print("\n" + SEP)
     print("🚀 TESTING PERSISTENT MEMORY & STRUCTURED JSON OUTPUT")
-    print("="*80)
+    print(SEP)
     print("\nThis script demonstrates:")
     print("  ✓ Low-latency caching")
     print("  ✓ Structured JSON output")
@@ -193,9 +204,9 @@ def main():
         # Save memory
         save_persistent_memory()
         
-        print("\n" + "="*80)
+        print("\n" + SEP)
         print("✅ ALL TESTS COMPLETED!")
-        print("="*80)
+        print(SEP)
         print("\n📝 Key Features Demonstrated:")
         print("  1. ⚡ Low-latency caching (< 50ms for cached queries)")
         print("  2. 📊 Structured JSON output with full attribution")
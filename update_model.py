@@ -4,46 +4,47 @@ Quick script to update the AGENT_MODEL in .env file
 """
 
 import os
+import re
 from pathlib import Path
 
+# Matches an AGENT_MODEL assignment line, tolerating leading indentation
+AGENT_MODEL_LINE = re.compile(r'^[ \t]*AGENT_MODEL=.*$', re.MULTILINE)
+
+# Available models, listed in menu order as (model name, description)
+MODELS = (
+    ("gemini-2.0-flash-exp", "Fast, default model"),
+    ("gemini-3-pro-preview", "Latest, most capable (PREVIEW)"),
+    ("gemini-1.5-pro", "Stable production model"),
+    ("gemini-1.5-flash", "Fast, lightweight model"),
+)
+
 
 def update_model_in_env(model_name: str):
     """Update or add AGENT_MODEL in .env file"""
     
     env_file = Path(__file__).parent / '.env'
     
-    if not env_file.exists():
+    try:
+        content = env_file.read_text()
+    except FileNotFoundError:
         print(f"❌ .env file not found at: {env_file}")
         print(f"   Creating new .env file...")
-        with open(env_file, 'w') as f:
-            f.write(f"AGENT_MODEL={model_name}\n")
+        env_file.write_text(f"AGENT_MODEL={model_name}\n")
         print(f"✅ Created .env with AGENT_MODEL={model_name}")
         return
     
-    # Read existing .env
-    with open(env_file, 'r') as f:
-        lines = f.readlines()
-    
-    # Check if AGENT_MODEL exists
-    model_found = False
-    new_lines = []
+    # Rewrite any existing AGENT_MODEL line in a single substitution
+    content, replaced = AGENT_MODEL_LINE.subn(lambda _: f'AGENT_MODEL={model_name}', content)
     
-    for line in lines:
-        if line.strip().startswith('AGENT_MODEL='):
-            new_lines.append(f'AGENT_MODEL={model_name}\n')
-            model_found = True
-            print(f"✅ Updated AGENT_MODEL to: {model_name}")
-        else:
-            new_lines.append(line)
-    
-    # If AGENT_MODEL doesn't exist, add it
-    if not model_found:
-        new_lines.append(f'\n# Model Configuration\nAGENT_MODEL={model_name}\n')
+    if replaced:
+        print(f"✅ Updated AGENT_MODEL to: {model_name}")
+    else:
+        # If AGENT_MODEL doesn't exist, add it
+        content += f'\n# Model Configuration\nAGENT_MODEL={model_name}\n'
         print(f"✅ Added AGENT_MODEL={model_name} to .env")
     
     # Write back
-    with open(env_file, 'w') as f:
-        f.writelines(new_lines)
+    env_file.write_text(content)
     
     print(f"📝 .env file updated successfully!")
     print(f"\n🔄 Please restart the agent for changes to take effect.")
@@ -54,17 +55,9 @@ def main():
     print("🤖 Agent Model Configuration Updater")
     print("=" * 50)
     
-    # Available models
-    models = {
-        "1": ("gemini-2.0-flash-exp", "Fast, default model"),
-        "2": ("gemini-3-pro-preview", "Latest, most capable (PREVIEW)"),
-        "3": ("gemini-1.5-pro", "Stable production model"),
-        "4": ("gemini-1.5-flash", "Fast, lightweight model"),
-    }
-    
     print("\nAvailable Models:")
-    for key, (model, desc) in models.items():
-        print(f"  {key}. {model}")
+    for number, (model, desc) in enumerate(MODELS, 1):
+        print(f"  {number}. {model}")
         print(f"     └─ {desc}")
     
     print("\n  5. Custom model name")
@@ -76,8 +69,8 @@ def main():
         print("👋 Exiting...")
         return
     
-    if choice in models:
-        model_name = models[choice][0]
+    if choice.isascii() and choice.isdigit() and 1 <= int(choice) <= len(MODELS):
+        model_name = MODELS[int(choice) - 1][0]
         update_model_in_env(model_name)
     elif choice == "5":
         model_name = input("Enter custom model name: ").strip()
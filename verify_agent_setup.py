@@ -5,6 +5,35 @@ This script checks if all files are in place without running the full agent.
 """
 import os
 import sys
+from pathlib import Path
+
+# (file, label, [(required tokens, ok message, failure message), ...])
+CONTENT_CHECKS = [
+    ("app/agent.py", "agent.py", [
+        (("from app.sub_agents.event_impact_agent import event_impact_agent",),
+         "Main agent.py imports event_impact_agent",
+         "Main agent.py missing event_impact_agent import"),
+        (("event_impact_agent",),
+         "Main agent.py includes event_impact_agent in sub_agents",
+         "Main agent.py missing event_impact_agent in sub_agents list"),
+    ]),
+    ("app/sub_agents/event_impact_agent/tools.py", "tools.py", [
+        (("def analyze_bond_volatility",),
+         "tools.py contains analyze_bond_volatility function",
+         "tools.py missing analyze_bond_volatility function"),
+        (("class EventDataLoader", "_memory_cache"),
+         "tools.py implements caching mechanism",
+         "tools.py missing caching implementation"),
+    ]),
+    ("app/sub_agents/event_impact_agent/agent.py", "event_impact_agent/agent.py", [
+        (("BOND TRADING",),
+         "agent.py contains bond trading instructions",
+         "agent.py missing bond trading instructions"),
+        (("analyze_bond_volatility",),
+         "agent.py imports bond analysis tools",
+         "agent.py missing bond analysis tool imports"),
+    ]),
+]
 
 def check_file_exists(filepath):
     """Check if a file exists"""
@@ -13,6 +42,11 @@ def check_file_exists(filepath):
     print(f"{status} {filepath}")
     return exists
 
+def check_tokens(filepath, tokens):
+    """Read a file once as raw bytes and report which tokens it contains"""
+    data = Path(filepath).read_bytes()
+    return {token: token.encode("utf-8") in data for token in tokens}
+
 def verify_agent_structure():
     """Verify the Event Impact Correlation Agent structure"""
     
@@ -39,72 +73,21 @@ def verify_agent_structure():
     print("\n📝 Checking file contents:")
     print("-" * 80)
     
-    # Check if agent.py has the import
-    try:
-        with open("app/agent.py", "r", encoding="utf-8") as f:
-            agent_content = f.read()
-            has_import = "from app.sub_agents.event_impact_agent import event_impact_agent" in agent_content
-            has_sub_agent = "event_impact_agent" in agent_content
-            
-            if has_import:
-                print("✅ Main agent.py imports event_impact_agent")
-            else:
-                print("❌ Main agent.py missing event_impact_agent import")
-                all_exist = False
-            
-            if has_sub_agent:
-                print("✅ Main agent.py includes event_impact_agent in sub_agents")
-            else:
-                print("❌ Main agent.py missing event_impact_agent in sub_agents list")
-                all_exist = False
-    except Exception as e:
-        print(f"❌ Error reading agent.py: {e}")
-        all_exist = False
-    
-    # Check if tools.py has the bond volatility function
-    try:
-        with open("app/sub_agents/event_impact_agent/tools.py", "r", encoding="utf-8") as f:
-            tools_content = f.read()
-            has_bond_analysis = "def analyze_bond_volatility" in tools_content
-            has_caching = "class EventDataLoader" in tools_content
-            has_memory_cache = "_memory_cache" in tools_content
-            
-            if has_bond_analysis:
-                print("✅ tools.py contains analyze_bond_volatility function")
-            else:
-                print("❌ tools.py missing analyze_bond_volatility function")
-                all_exist = False
-            
-            if has_caching and has_memory_cache:
-                print("✅ tools.py implements caching mechanism")
-            else:
-                print("❌ tools.py missing caching implementation")
-                all_exist = False
-    except Exception as e:
-        print(f"❌ Error reading tools.py: {e}")
-        all_exist = False
-    
-    # Check if agent.py has the comprehensive instructions
-    try:
-        with open("app/sub_agents/event_impact_agent/agent.py", "r", encoding="utf-8") as f:
-            agent_file_content = f.read()
-            has_bond_instructions = "BOND TRADING" in agent_file_content
-            has_tools_import = "analyze_bond_volatility" in agent_file_content
-            
-            if has_bond_instructions:
-                print("✅ agent.py contains bond trading instructions")
-            else:
-                print("❌ agent.py missing bond trading instructions")
-                all_exist = False
-            
-            if has_tools_import:
-                print("✅ agent.py imports bond analysis tools")
+    for filepath, label, checks in CONTENT_CHECKS:
+        tokens = [token for required, _, _ in checks for token in required]
+        try:
+            found = check_tokens(filepath, tokens)
+        except Exception as e:
+            print(f"❌ Error reading {label}: {e}")
+            all_exist = False
+            continue
+        
+        for required, ok_message, fail_message in checks:
+            if all(found[token] for token in required):
+                print(f"✅ {ok_message}")
             else:
-                print("❌ agent.py missing bond analysis tool imports")
+                print(f"❌ {fail_message}")
                 all_exist = False
-    except Exception as e:
-        print(f"❌ Error reading event_impact_agent/agent.py: {e}")
-        all_exist = False
     
     print("\n" + "="*80)
     if all_exist: